@@ -8,19 +8,59 @@ from __future__ import annotations
 from pathlib import Path
 import shutil
 import tempfile
-from typing import Optional, Union, List, Dict, Any
+from typing import Optional, Union, List, Dict, Any, Callable, Mapping, Tuple
 import subprocess
 import json
+import logging
 import os
 import datetime
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
 
-# Extensiones de audio soportadas
-AUDIO_EXT = {'.mp3', '.wav', '.m4a', '.flac', '.opus', '.ogg', '.aac', '.wma'}
+# PyAV es opcional: lee la duración con libavformat sin lanzar ffprobe
+try:
+    import av
+except ImportError:
+    av = None
+
+# Extensiones de audio soportadas (en minúsculas; inmutable para compartirla)
+AUDIO_EXT = frozenset({'.mp3', '.wav', '.m4a', '.flac', '.opus', '.ogg', '.aac', '.wma'})
 
 # Directorio temporal para chunks y VAD
 TEMP_DIR = Path(tempfile.gettempdir()) / "whisper_temp"
 TEMP_DIR.mkdir(exist_ok=True)
 
+# Trabajos que se dejaron a medias (cierre brusco) se barren pasado un día
+WORK_DIR_MAX_AGE = 24 * 3600
+
+def make_work_dir() -> Path:
+    """Directorio temporal propio de un trabajo (VAD, chunks, compresión)"""
+    cutoff = time.time() - WORK_DIR_MAX_AGE
+    for d in TEMP_DIR.glob("job_*"):
+        try:
+            if d.stat().st_mtime < cutoff:
+                shutil.rmtree(d, ignore_errors=True)
+        except OSError:
+            pass
+    return Path(tempfile.mkdtemp(prefix="job_", dir=TEMP_DIR))
+
+def remove_work_dir(work_dir: Path):
+    """Borrar el directorio temporal de un trabajo terminado"""
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+def _temp_name(audio_path: Path) -> str:
+    """Nombre temporal por ruta completa: talk.mp3 y talk.wav no chocan"""
+    digest = hashlib.sha1(str(Path(audio_path).resolve()).encode("utf-8")).hexdigest()[:10]
+    return f"{audio_path.stem}_{digest}"
+
 # Costes por minuto (USD)
 MODEL_COSTS = {
     # OpenAI
@@ -65,15 +105,30 @@ def budget_get_data() -> dict:
     except Exception:
         return {'limit': 2.0, 'consumed': 0.0, 'date': None}
 
+def atomic_write_bytes(path: Path, payload: bytes):
+    """Escribir un archivo completo de forma atómica (temporal + os.replace)"""
+    # Temporal único por escritor: workers y el hilo de Tk pueden escribir
+    # el mismo archivo a la vez
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def _budget_write(data: dict):
+    """Guardar el presupuesto (nunca queda a medias)"""
+    atomic_write_bytes(_budget_file, json.dumps(data).encode("utf-8"))
+
 def budget_set_limit(limit: float):
     """Establecer límite de presupuesto"""
     try:
         data = budget_get_data()
         data['limit'] = limit
-        with open(_budget_file, 'w') as f:
-            json.dump(data, f)
+        _budget_write(data)
     except Exception as e:
-        print(f"Error guardando límite de presupuesto: {e}")
+        logger.error("Error guardando límite de presupuesto: %s", e)
 
 def budget_allow(cost: float) -> bool:
     """Verificar si hay presupuesto disponible"""
@@ -83,15 +138,14 @@ def budget_allow(cost: float) -> bool:
         if data.get('date') != today:
             data['consumed'] = 0.0
             data['date'] = today
-            with open(_budget_file, 'w') as f:
-                json.dump(data, f)
+            _budget_write(data)
         
         return (data['consumed'] + cost) <= data['limit']
     except Exception:
         return True  # En caso de error, permitir
 
-def budget_consume(cost: float):
-    """Consumir presupuesto"""
+def budget_consume(cost: float) -> Optional[str]:
+    """Consumir presupuesto; devuelve el día (ISO) al que se cargó"""
     try:
         data = budget_get_data()
         today = datetime.date.today().isoformat()
@@ -99,10 +153,26 @@ def budget_consume(cost: float):
             data['consumed'] = 0.0
             data['date'] = today
         data['consumed'] += cost
-        with open(_budget_file, 'w') as f:
-            json.dump(data, f)
+        _budget_write(data)
+        return today
+    except Exception as e:
+        logger.error("Error consumiendo presupuesto: %s", e)
+        return None
+
+def budget_refund(cost: float, day: Optional[str]):
+    """Devolver una reserva de budget_consume hecha el día `day`
+    
+    Si el contador ya pasó a otro día la reserva se perdió con el reset:
+    no se descuenta del día nuevo ni se deja el consumo en negativo.
+    """
+    try:
+        data = budget_get_data()
+        if day is None or data.get('date') != day:
+            return
+        data['consumed'] = max(0.0, data['consumed'] - cost)
+        _budget_write(data)
     except Exception as e:
-        print(f"Error consumiendo presupuesto: {e}")
+        logger.error("Error devolviendo presupuesto: %s", e)
 
 def budget_get_remaining() -> float:
     """Obtener presupuesto restante"""
@@ -118,12 +188,40 @@ def budget_get_remaining() -> float:
 
 def probe_duration(audio_path: Path) -> int:
     """Obtener duración del audio en segundos"""
+    try:
+        # La clave incluye mtime y tamaño: si el archivo cambia, se vuelve a medir
+        st = Path(audio_path).stat()
+        return _probe_cached(str(audio_path), st.st_mtime_ns, st.st_size)
+    except RuntimeError:
+        raise
+    except Exception as e:
+        logger.warning("No se pudo obtener duración exacta: %s", e)
+        return 60  # Asumir 1 minuto como fallback
+
+def _probe_av(path_str: str) -> Optional[int]:
+    """Duración con PyAV; None si no está instalado o no la conoce"""
+    if av is None:
+        return None
+    try:
+        with av.open(path_str) as container:
+            if container.duration is None:
+                return None
+            return int(container.duration / av.time_base)
+    except Exception:
+        return None  # Formato raro: que lo intente ffprobe
+
+@lru_cache(maxsize=4096)
+def _probe_cached(path_str: str, mtime_ns: int, size: int) -> int:
+    """Medir duración (resultado cacheado por ruta, mtime y tamaño)"""
+    duration = _probe_av(path_str)
+    if duration is not None:
+        return duration
     try:
         cmd = [
             'ffprobe', '-v', 'error',
             '-show_entries', 'format=duration',
             '-of', 'default=noprint_wrappers=1:nokey=1',
-            str(audio_path)
+            path_str
         ]
         startupinfo = None
         if os.name == 'nt':
@@ -137,7 +235,7 @@ def probe_duration(audio_path: Path) -> int:
         
         if not duration_str:
             # Intentar método alternativo
-            cmd2 = ['ffprobe', '-i', str(audio_path), '-show_entries', 
+            cmd2 = ['ffprobe', '-i', path_str, '-show_entries', 
                    'format=duration', '-v', 'quiet', '-of', 'csv=p=0']
             result2 = subprocess.run(cmd2, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
                                    encoding='utf-8', errors='replace',
@@ -158,19 +256,19 @@ def probe_duration(audio_path: Path) -> int:
             "Mac: brew install ffmpeg\n"
             "Linux: sudo apt install ffmpeg"
         )
-    except Exception as e:
-        print(f"Advertencia: No se pudo obtener duración exacta: {e}")
-        return 60  # Asumir 1 minuto como fallback
 
+@lru_cache(maxsize=1024)
 def estimate_cost(duration_seconds: int, model: str) -> float:
     """Estimar coste de transcripción"""
     minutes = max(1, duration_seconds / 60.0)  # Mínimo 1 minuto
     price_per_min = MODEL_COSTS.get(model, 0.006)
     return minutes * price_per_min
 
-def preprocess_vad_ffmpeg(audio_path: Path) -> Path:
+def preprocess_vad_ffmpeg(audio_path: Path, work_dir: Optional[Path] = None) -> Path:
     """Preprocesar audio con VAD para eliminar silencios"""
-    output = TEMP_DIR / f"{audio_path.stem}_vad{audio_path.suffix}"
+    # Salida ya comprimida como los chunks (mp3 mono 16 kHz): sin WAV intermedio
+    # enorme, y split_for_api la corta con copia de stream (encoded=True)
+    output = (work_dir or TEMP_DIR) / f"{_temp_name(audio_path)}_vad.mp3"
     
     # Limpiar archivos temporales viejos
     for f in TEMP_DIR.glob("*_vad.*"):
@@ -180,10 +278,6 @@ def preprocess_vad_ffmpeg(audio_path: Path) -> Path:
             except:
                 pass
     
-    # Si ya existe y es reciente, devolverla
-    if output.exists() and (datetime.datetime.now() - datetime.datetime.fromtimestamp(output.stat().st_mtime)).seconds < 3600:
-        return output
-    
     try:
         cmd = [
             'ffmpeg', '-i', str(audio_path),
@@ -191,6 +285,10 @@ def preprocess_vad_ffmpeg(audio_path: Path) -> Path:
                    'detection=peak,aformat=dblp,areverse,'
                    'silenceremove=start_periods=1:start_duration=1:start_threshold=-50dB:'
                    'detection=peak,aformat=dblp,areverse',
+            '-c:a', 'libmp3lame',
+            '-q:a', '7',
+            '-ac', '1',
+            '-ar', '16000',
             '-y', str(output)
         ]
         
@@ -204,14 +302,20 @@ def preprocess_vad_ffmpeg(audio_path: Path) -> Path:
                               check=True, timeout=300, startupinfo=startupinfo)
         return output
     except Exception as e:
-        print(f"Advertencia: No se pudo aplicar VAD, usando archivo original: {e}")
+        logger.warning("No se pudo aplicar VAD, usando archivo original: %s", e)
         return audio_path  # Devolver original si falla
 
-from concurrent.futures import ThreadPoolExecutor
-import threading
-
-def split_for_api(audio_path: Path, bitrate_kbps: int = 64) -> List[Path]:
-    """Dividir audio en chunks si es necesario usando procesamiento paralelo"""
+def split_for_api(audio_path: Path, bitrate_kbps: int = 64,
+                  work_dir: Optional[Path] = None,
+                  encoded: bool = False) -> Tuple[List[Path], List[float]]:
+    """Dividir audio en chunks si es necesario usando procesamiento paralelo
+    
+    Devuelve (chunks, duraciones en segundos de cada chunk), sin volver a
+    lanzar ffprobe por chunk: las duraciones salen del propio troceado.
+    Con `work_dir` los temporales van ahí en lugar de TEMP_DIR.
+    Con `encoded` el audio ya está en el formato de los chunks (salida de
+    preprocess_vad_ffmpeg) y se corta sin volver a codificar.
+    """
     # Limpiar chunks viejos
     for f in TEMP_DIR.glob("*_chunk_*.mp3"):
         if (datetime.datetime.now() - datetime.datetime.fromtimestamp(f.stat().st_mtime)).days > 1:
@@ -223,21 +327,21 @@ def split_for_api(audio_path: Path, bitrate_kbps: int = 64) -> List[Path]:
     try:
         duration = probe_duration(audio_path)
         if duration <= 0:
-            print(f"Advertencia: No se pudo detectar duración válida para {audio_path}")
-            return [audio_path]
+            logger.warning("No se pudo detectar duración válida para %s", audio_path)
+            return [audio_path], [0]
     except Exception as e:
-        print(f"Error detectando duración: {e}")
-        return [audio_path]
+        logger.error("Error detectando duración: %s", e)
+        return [audio_path], [0]
     
     # Verificar tamaño del archivo
     file_size_mb = audio_path.stat().st_size / (1024 * 1024)
     
     # Si es menor a 25MB y 25 minutos, no dividir
     if file_size_mb <= 25 and duration < 1500:
-        return [audio_path]
+        return [audio_path], [duration]
     
     # Directorio para chunks en temp
-    chunk_dir = TEMP_DIR / f"chunks_{audio_path.stem}"
+    chunk_dir = (work_dir or TEMP_DIR) / f"chunks_{_temp_name(audio_path)}"
     chunk_dir.mkdir(exist_ok=True)
     
     # Ajustar duración del chunk basado en el tamaño y bitrate objetivo
@@ -248,6 +352,10 @@ def split_for_api(audio_path: Path, bitrate_kbps: int = 64) -> List[Path]:
     
     overlap = 5  # 5 segundos de solapamiento
     
+    chunks: List[Path] = []
+    chunk_durations: Dict[Path, float] = {}
+    chunks_lock = threading.Lock()
+    
     # Calcular chunks con solapamiento
     starts = []
     i = 0
@@ -260,29 +368,36 @@ def split_for_api(audio_path: Path, bitrate_kbps: int = 64) -> List[Path]:
         idx, start = start_idx_pair
         output = chunk_dir / f"chunk_{idx:03d}.mp3"
         
+        # Ajustar duración para el último chunk
+        current_duration = min(chunk_duration, duration - start + overlap)
+        
         # Si el chunk ya existe y es válido, usarlo
         if output.exists() and output.stat().st_size > 0:
             chunk_size_mb = output.stat().st_size / (1024 * 1024)
             if chunk_size_mb <= 25:
                 with chunks_lock:
                     chunks.append(output)
+                    chunk_durations[output] = current_duration
                 return True
             else:
                 output.unlink()
         
-        # Ajustar duración para el último chunk
-        current_duration = min(chunk_duration, duration - start + overlap)
-        
         # Configuración optimizada para velocidad
+        if encoded:
+            codec = ['-c:a', 'copy']  # Ya es mp3 mono 16 kHz: no re-codificar
+        else:
+            codec = [
+                '-c:a', 'libmp3lame',  # Usar LAME para mejor compresión
+                '-q:a', '7',           # Calidad VBR más baja pero aceptable
+                '-ac', '1',            # Mono
+                '-ar', '16000',        # 16kHz es suficiente para voz
+                '-threads', '0',       # Usar todos los núcleos disponibles
+            ]
         cmd = [
             'ffmpeg', '-i', str(audio_path),
             '-ss', str(start),
             '-t', str(current_duration),
-            '-c:a', 'libmp3lame',  # Usar LAME para mejor compresión
-            '-q:a', '7',           # Calidad VBR más baja pero aceptable
-            '-ac', '1',            # Mono
-            '-ar', '16000',        # 16kHz es suficiente para voz
-            '-threads', '0',       # Usar todos los núcleos disponibles
+            *codec,
             '-y', str(output)
         ]
         
@@ -302,11 +417,12 @@ def split_for_api(audio_path: Path, bitrate_kbps: int = 64) -> List[Path]:
                 if chunk_size_mb <= 25:
                     with chunks_lock:
                         chunks.append(output)
+                        chunk_durations[output] = current_duration
                     return True
                 else:
                     output.unlink()
         except Exception as e:
-            print(f"Error en chunk {idx}: {e}")
+            logger.error("Error en chunk %d: %s", idx, e)
             if output.exists():
                 output.unlink()
         return False
@@ -318,8 +434,8 @@ def split_for_api(audio_path: Path, bitrate_kbps: int = 64) -> List[Path]:
         
     # Si no se pudo crear ningún chunk, intentar comprimir el archivo completo
     if not chunks:
-        print("Advertencia: División en chunks falló, intentando comprimir archivo completo...")
-        compressed = TEMP_DIR / f"{audio_path.stem}_compressed.mp3"
+        logger.warning("División en chunks falló, intentando comprimir archivo completo...")
+        compressed = (work_dir or TEMP_DIR) / f"{_temp_name(audio_path)}_compressed.mp3"
         try:
             cmd = [
                 'ffmpeg', '-i', str(audio_path),
@@ -335,18 +451,18 @@ def split_for_api(audio_path: Path, bitrate_kbps: int = 64) -> List[Path]:
                          check=True, timeout=300, startupinfo=startupinfo)
             
             if compressed.exists() and compressed.stat().st_size / (1024 * 1024) <= 25:
-                return [compressed]
+                return [compressed], [duration]
         except Exception as e:
-            print(f"Error comprimiendo archivo: {e}")
+            logger.error("Error comprimiendo archivo: %s", e)
             if compressed.exists():
                 compressed.unlink()
         
-        return [audio_path]
+        return [audio_path], [duration]
     
     # Ordenar chunks por número
     chunks.sort()
     
-    return chunks
+    return chunks, [chunk_durations[c] for c in chunks]
 
 # ============================================================================
 # RESULTADO DE TRANSCRIPCIÓN
@@ -412,10 +528,10 @@ def transcribe_file_local(audio_path: Path, model_size: str = "base") -> Transcr
         model_size = model_size.replace('local-', '')
     
     try:
-        print(f"Cargando modelo Whisper {model_size}...")
+        logger.info("Cargando modelo Whisper %s...", model_size)
         model = whisper.load_model(model_size)
         
-        print(f"Transcribiendo {audio_path.name}...")
+        logger.info("Transcribiendo %s...", audio_path.name)
         result = model.transcribe(
             str(audio_path),
             language="es",
@@ -432,6 +548,166 @@ def transcribe_file_local(audio_path: Path, model_size: str = "base") -> Transcr
     except Exception as e:
         raise RuntimeError(f"Error en transcripción local: {e}")
 
+# ============================================================================
+# CACHÉ DE TRANSCRIPCIONES
+# ============================================================================
+
+# Raíz de datos de la app (la misma que usa whisper_gui para config e historial)
+APP_ROOT = Path(os.getenv("APPDATA", Path.home())) / ".whisper4"
+CACHE_DB = APP_ROOT / "transcripts.db"
+CACHE_TTL = 30 * 24 * 3600  # 30 días
+HASH_BLOCK_SIZE = 1 << 20
+
+@lru_cache(maxsize=512)
+def _digest_cached(path_str: str, mtime_ns: int, size: int) -> str:
+    """SHA-256 del archivo (cacheado por ruta, mtime y tamaño)"""
+    # En bloques de 1 MB: memoria constante aunque el chunk pese 25 MB
+    with open(path_str, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        h = hashlib.sha256()
+        while chunk := f.read(HASH_BLOCK_SIZE):
+            h.update(chunk)
+        return h.hexdigest()
+
+def file_digest(audio_path: Path) -> str:
+    """Huella del contenido de un archivo de audio"""
+    st = audio_path.stat()
+    return _digest_cached(str(audio_path), st.st_mtime_ns, st.st_size)
+
+class TranscriptCache:
+    """Caché en disco (sqlite) de transcripciones por contenido de audio y modelo"""
+    
+    def __init__(self, path: Path = CACHE_DB, ttl: float = CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        # La base se crea en el primer uso: importar core no toca el disco
+        self._ready = False
+        self._init_lock = threading.Lock()
+    
+    def _ensure_schema(self):
+        """Crear directorio y tabla la primera vez"""
+        with self._init_lock:
+            if self._ready:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), timeout=10)
+            try:
+                with db:
+                    db.execute("CREATE TABLE IF NOT EXISTS transcripts ("
+                               "key TEXT PRIMARY KEY, text TEXT, segments TEXT, "
+                               "language TEXT, created REAL)")
+            finally:
+                db.close()
+            self._ready = True
+    
+    @contextmanager
+    def _connect(self):
+        if not self._ready:
+            self._ensure_schema()
+        # Una conexión por operación: se usa desde varios hilos a la vez
+        db = sqlite3.connect(str(self.path), timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+    
+    @staticmethod
+    def key(audio_path: Path, model: str, language: str = 'es') -> str:
+        """Clave: contenido del audio + modelo + idioma"""
+        return f"{file_digest(audio_path)}:{model}:{language}"
+    
+    def get(self, key: str) -> Optional[TranscriptionResult]:
+        """Devolver la transcripción cacheada, o None si no existe o caducó"""
+        try:
+            with self._connect() as db:
+                row = db.execute(
+                    "SELECT text, segments, language FROM transcripts "
+                    "WHERE key = ? AND created >= ?",
+                    (key, time.time() - self.ttl)).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            logger.error("Error leyendo caché de transcripciones: %s", e)
+            return None
+        if row is None:
+            return None
+        return TranscriptionResult(text=row[0], segments=json.loads(row[1]), language=row[2])
+    
+    def contains(self, key: str) -> bool:
+        """Comprobar si hay entrada válida para la clave"""
+        return self.get(key) is not None
+    
+    def put(self, key: str, result: TranscriptionResult):
+        """Guardar una transcripción"""
+        try:
+            with self._connect() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?)",
+                    (key, result.text, json.dumps(result.segments, ensure_ascii=False),
+                     result.language, time.time()))
+        except (sqlite3.Error, OSError) as e:
+            logger.error("Error guardando en caché de transcripciones: %s", e)
+    
+    def clear(self):
+        """Vaciar la caché"""
+        with self._connect() as db:
+            db.execute("DELETE FROM transcripts")
+
+transcript_cache = TranscriptCache()
+
+def lookup_cached(parts: List[Path], model: str) -> Dict[Path, TranscriptionResult]:
+    """Transcripciones ya cacheadas de `parts`, para pasarlas a transcribe_file"""
+    found = {}
+    for part in parts:
+        try:
+            result = transcript_cache.get(TranscriptCache.key(part, model))
+        except OSError:
+            continue
+        if result is not None:
+            found[part] = result
+    return found
+
+def is_cached(audio_path: Path, model: str) -> bool:
+    """¿Hay transcripción cacheada para este audio y modelo?"""
+    try:
+        return transcript_cache.contains(TranscriptCache.key(audio_path, model))
+    except OSError:
+        return False
+
+# ============================================================================
+# CLIENTES API (cacheados por api_key)
+# ============================================================================
+
+@lru_cache(maxsize=8)
+def get_openai_client(api_key: str):
+    """Cliente OpenAI reutilizable para una api_key"""
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+@lru_cache(maxsize=8)
+def get_groq_client(api_key: str):
+    """Cliente Groq reutilizable para una api_key"""
+    from groq import Groq
+    return Groq(api_key=api_key)
+
+# Subidas concurrentes de chunks: límite global y por proveedor (evita 429)
+MAX_UPLOAD_WORKERS = 4
+_PROVIDER_SEMAPHORES = {
+    'groq': threading.BoundedSemaphore(MAX_UPLOAD_WORKERS),
+    'openai': threading.BoundedSemaphore(MAX_UPLOAD_WORKERS),
+}
+# Pool compartido por todas las llamadas a transcribe_file (lotes incluidos):
+# sin crear hilos por archivo; los semáforos siguen limitando cada proveedor
+_API_POOL = ThreadPoolExecutor(max_workers=MAX_UPLOAD_WORKERS * len(_PROVIDER_SEMAPHORES),
+                               thread_name_prefix="whisper-api")
+# Al cerrar la app: los chunks que aún no han empezado no se suben
+_shutdown = threading.Event()
+
+def shutdown_api_pool():
+    """Cancelar las subidas pendientes; solo se espera al chunk en curso"""
+    _shutdown.set()
+    _API_POOL.shutdown(wait=False, cancel_futures=True)
+
 # ============================================================================
 # TRANSCRIPCIÓN - GROQ API
 # ============================================================================
@@ -474,7 +750,7 @@ def transcribe_file_groq(audio_path: Path, model: str = "whisper-large-v3",
         model = model.replace('groq-', '')
     
     try:
-        client = Groq(api_key=api_key)
+        client = get_groq_client(api_key)
         
         # Verificar tamaño del archivo (límite de Groq es 25MB)
         file_size_mb = audio_path.stat().st_size / (1024 * 1024)
@@ -539,7 +815,7 @@ def transcribe_file_openai(audio_path: Path, model: str = "whisper-1",
         )
     
     try:
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         
         # Verificar tamaño del archivo (límite de OpenAI es 25MB)
         file_size_mb = audio_path.stat().st_size / (1024 * 1024)
@@ -644,10 +920,87 @@ def transcribe_file_openai(audio_path: Path, model: str = "whisper-1",
 # FUNCIÓN UNIFICADA DE TRANSCRIPCIÓN
 # ============================================================================
 
+def _transcribe_chunk(chunk: Path, provider: str, model: str,
+                      api_key: str = None, lookup: bool = True) -> TranscriptionResult:
+    """Transcribir un chunk respetando el límite de concurrencia del proveedor
+    
+    Con `lookup=False` el llamador ya sabe que no está en la caché.
+    """
+    key = TranscriptCache.key(chunk, model)
+    if lookup:
+        cached = transcript_cache.get(key)
+        if cached is not None:
+            return cached
+    
+    with _PROVIDER_SEMAPHORES[provider]:
+        # Se comprueba tras esperar el turno: al cerrar no arranca otra subida
+        if _shutdown.is_set():
+            raise RuntimeError("Transcripción cancelada: la aplicación se está cerrando")
+        if provider == 'groq':
+            result = transcribe_file_groq(chunk, model, api_key)
+        else:
+            result = transcribe_file_openai(chunk, model, api_key)
+    
+    transcript_cache.put(key, result)
+    return result
+
+def _merge_chunk_results(results: List[TranscriptionResult],
+                         durations: List[float], overlap: float = 5) -> TranscriptionResult:
+    """Unir los resultados de los chunks de split_for_api en uno solo
+    
+    Cada chunk empieza `overlap` segundos antes de que acabe el anterior,
+    así que su desplazamiento es la suma de (duración - overlap) previa.
+    """
+    all_text = []
+    all_segments = []
+    overlap_threshold = 2.0  # Umbral para detectar duplicados en solapamiento
+    offset = 0.0
+    
+    for i, result in enumerate(results):
+        # Filtrar segmentos duplicados en zona de solapamiento
+        if i > 0 and result.segments:
+            # Ignorar segmentos en primeros 2 segundos si no es primer chunk
+            result.segments = [s for s in result.segments if s['start'] >= overlap_threshold]
+        
+        # Ajustar tiempos
+        for seg in result.segments:
+            seg['start'] += offset
+            seg['end'] += offset
+        offset += durations[i] - overlap
+        
+        # Agregar al resultado
+        text = result.text.strip()
+        if text:  # Solo agregar si hay texto
+            if all_text and not text.startswith('.') and not text.startswith('!') and not text.startswith('?'):
+                all_text.append(' ' + text)
+            else:
+                all_text.append(text)
+        
+        all_segments.extend(result.segments)
+    
+    # Ordenar segmentos por tiempo
+    all_segments.sort(key=lambda x: x['start'])
+    
+    return TranscriptionResult(
+        text=''.join(all_text),
+        segments=all_segments,
+        language='es'
+    )
+
 def transcribe_file(audio_path: Path, model: str = "groq-whisper-large-v3", 
-                   api_key: str = None) -> TranscriptionResult:
+                   api_key: str = None, parts: Optional[List[Path]] = None,
+                   progress_callback: Optional[Callable[[int, int], None]] = None,
+                   durations: Optional[List[float]] = None,
+                   cached: Optional[Mapping[Path, TranscriptionResult]] = None
+                   ) -> TranscriptionResult:
     """
     Transcribir archivo usando el proveedor apropiado según el modelo
+    
+    Si se pasan `parts` (de split_for_api) no se vuelve a dividir el audio;
+    `durations` son las duraciones de cada parte, para colocar los segmentos.
+    `cached` (de lookup_cached sobre esas `parts`) evita consultar otra vez la
+    caché: lo que no está ahí se transcribe directamente.
+    `progress_callback(hechos, total)` se llama desde hilos de trabajo.
     """
     if not audio_path.exists():
         raise FileNotFoundError(f"Archivo no encontrado: {audio_path}")
@@ -656,8 +1009,8 @@ def transcribe_file(audio_path: Path, model: str = "groq-whisper-large-v3",
     
     # Verificar tamaño y pre-procesar si es necesario
     file_size_mb = audio_path.stat().st_size / (1024 * 1024)
-    if file_size_mb > 25 and provider != 'local':
-        print(f"Archivo de {file_size_mb:.1f}MB - Dividiendo en chunks...")
+    if file_size_mb > 25 and provider != 'local' and not parts:
+        logger.info("Archivo de %.1fMB - Dividiendo en chunks...", file_size_mb)
         # Comprimir el audio si es muy grande
         compressed_path = audio_path.parent / f"{audio_path.stem}_compressed{audio_path.suffix}"
         if not compressed_path.exists():
@@ -669,17 +1022,17 @@ def transcribe_file(audio_path: Path, model: str = "groq-whisper-large-v3",
                 ], check=True, capture_output=True)
                 audio_path = compressed_path
             except Exception as e:
-                print(f"No se pudo comprimir: {e}")
-    
-    chunk_duration = 1200  # 20 minutos
-    overlap = 5  # 5 segundos de solapamiento
+                logger.warning("No se pudo comprimir: %s", e)
     
     try:
         if provider == 'local':
             return transcribe_file_local(audio_path, model)
         
         # Dividir en chunks si es necesario
-        chunks = split_for_api(audio_path)
+        if parts:
+            chunks = list(parts)
+        else:
+            chunks, durations = split_for_api(audio_path)
         
         # Si después de dividir solo hay un chunk y es muy grande, intentar comprimir más
         if len(chunks) == 1 and chunks[0].stat().st_size / (1024 * 1024) > 25:
@@ -693,59 +1046,39 @@ def transcribe_file(audio_path: Path, model: str = "groq-whisper-large-v3",
                 ], check=True, capture_output=True)
                 chunks = [compressed_chunk]
             except Exception as e:
-                print(f"Error comprimiendo chunk: {e}")
+                logger.error("Error comprimiendo chunk: %s", e)
                 raise ValueError(f"No se pudo reducir el tamaño del archivo a menos de 25MB")
         
+        lookup = cached is None
+        cached = cached or {}
+        
         if len(chunks) == 1:
-            if provider == 'groq':
-                return transcribe_file_groq(chunks[0], model, api_key)
-            else:
-                return transcribe_file_openai(chunks[0], model, api_key)
-        
-        # Procesar múltiples chunks
-        all_text = []
-        all_segments = []
-        overlap_threshold = 2.0  # Umbral para detectar duplicados en solapamiento
-        
-        for i, chunk in enumerate(chunks):
-            print(f"Procesando chunk {i+1} de {len(chunks)}...")
-            # Transcribir chunk
-            if provider == 'groq':
-                result = transcribe_file_groq(chunk, model, api_key)
-            else:
-                result = transcribe_file_openai(chunk, model, api_key)
-            
-            # Ajustar tiempos para segmentos
-            offset = i * (chunk_duration - overlap)
-            
-            # Filtrar segmentos duplicados en zona de solapamiento
-            if i > 0 and result.segments:
-                # Ignorar segmentos en primeros 2 segundos si no es primer chunk
-                result.segments = [s for s in result.segments if s['start'] >= overlap_threshold]
-            
-            # Ajustar tiempos
-            for seg in result.segments:
-                seg['start'] += offset
-                seg['end'] += offset
-            
-            # Agregar al resultado
-            text = result.text.strip()
-            if text:  # Solo agregar si hay texto
-                if all_text and not text.startswith('.') and not text.startswith('!') and not text.startswith('?'):
-                    all_text.append(' ' + text)
-                else:
-                    all_text.append(text)
-            
-            all_segments.extend(result.segments)
+            if chunks[0] in cached:
+                return cached[chunks[0]]
+            return _transcribe_chunk(chunks[0], provider, model, api_key, lookup)
         
-        # Ordenar segmentos por tiempo
-        all_segments.sort(key=lambda x: x['start'])
+        # Subir chunks en paralelo (I/O de red); el orden se conserva por índice
+        logger.info("Procesando %d chunks en paralelo...", len(chunks))
+        results: List[Optional[TranscriptionResult]] = [cached.get(c) for c in chunks]
+        futures = {
+            _API_POOL.submit(_transcribe_chunk, chunk, provider, model, api_key, lookup): i
+            for i, chunk in enumerate(chunks) if results[i] is None
+        }
+        try:
+            # Los chunks ya cacheados cuentan como hechos desde el principio
+            for done, future in enumerate(as_completed(futures), len(chunks) - len(futures) + 1):
+                results[futures[future]] = future.result()
+                if progress_callback:
+                    progress_callback(done, len(chunks))
+        except BaseException:
+            # Un chunk falló: no seguir subiendo el resto del archivo
+            for future in futures:
+                future.cancel()
+            raise
         
-        return TranscriptionResult(
-            text=''.join(all_text),
-            segments=all_segments,
-            language='es'
-        )
+        if not durations or len(durations) != len(chunks):
+            durations = [probe_duration(chunk) for chunk in chunks]
+        return _merge_chunk_results(results, durations)
             
     except Exception as e:
         # Re-lanzar con contexto adicional
@@ -755,8 +1088,9 @@ def transcribe_file(audio_path: Path, model: str = "groq-whisper-large-v3",
 # INFORMACIÓN DE PROVEEDORES
 # ============================================================================
 
-def get_provider_info(model: str) -> Dict[str, Any]:
-    """Obtener información sobre un proveedor/modelo"""
+@lru_cache(maxsize=None)
+def get_provider_info(model: str) -> Mapping[str, Any]:
+    """Obtener información sobre un proveedor/modelo (de solo lectura, cacheada)"""
     provider = PROVIDER_MAP.get(model, 'unknown')
     cost_per_min = MODEL_COSTS.get(model, 0)
     
@@ -777,17 +1111,17 @@ def get_provider_info(model: str) -> Dict[str, Any]:
     else:
         info['savings_vs_openai'] = 0
     
-    return info
+    return MappingProxyType(info)
+
+# Información precalculada de todos los modelos (MODEL_COSTS es constante)
+MODEL_INFO: Dict[str, Mapping[str, Any]] = {m: get_provider_info(m) for m in MODEL_COSTS}
+
+# Ordenada por coste (más barato primero, gratis al final)
+_MODELS_BY_COST = tuple(sorted(
+    MODEL_INFO.values(),
+    key=lambda x: (x['cost_per_min'] if x['cost_per_min'] > 0 else float('inf'))
+))
 
-def get_all_models_info() -> List[Dict[str, Any]]:
+def get_all_models_info() -> List[Mapping[str, Any]]:
     """Obtener información de todos los modelos disponibles"""
-    models_info = []
-    
-    for model in MODEL_COSTS.keys():
-        info = get_provider_info(model)
-        models_info.append(info)
-    
-    # Ordenar por coste (más barato primero, gratis al final)
-    models_info.sort(key=lambda x: (x['cost_per_min'] if x['cost_per_min'] > 0 else float('inf')))
-    
-    return models_info
+    return list(_MODELS_BY_COST)
@@ -2,9 +2,15 @@ from dataclasses import dataclass
 import tkinter as tk
 from tkinter import ttk
 import datetime as dt
+import logging
+from itertools import islice
 from pathlib import Path
 import os
-import json
+
+logger = logging.getLogger(__name__)
+
+# Registros a dibujar por tanda antes de devolver el control a Tk
+RENDER_BATCH_SIZE = 100
 
 @dataclass
 class TranscriptionRecord:
@@ -20,7 +26,8 @@ class HistoryTab:
     """Pestaña de historial"""
     def __init__(self, app):
         self.app = app
-        self.history_file = Path(app.config.output_dir).parent / "history.json"
+        # History de la app (JSONL); se lee línea a línea
+        self.history = app.history
         self._build_history_tab()
     
     def _build_history_tab(self):
@@ -47,54 +54,9 @@ class HistoryTab:
                  font=("Segoe UI", 12, "bold")).pack(pady=10)
         
         try:
-            # Cargar historial desde archivo
-            if self.history_file.exists():
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    records = json.load(f)
-            else:
-                records = []
-            
-            # Lista de transcripciones
-            for record in sorted(records, key=lambda x: x['date'], reverse=True):
-                # Frame para cada registro
-                frame = ttk.Frame(scrollable_frame)
-                frame.pack(fill="x", padx=5, pady=5)
-                
-                # Fecha y archivo original
-                date_str = dt.datetime.fromtimestamp(record['date']).strftime("%Y-%m-%d %H:%M")
-                filename = Path(record['original_file']).name if record['original_file'] else 'Archivo desconocido'
-                
-                ttk.Label(frame, text=f"🕒 {date_str}", font=("Segoe UI", 9)).pack(anchor="w")
-                ttk.Label(frame, text=f"📄 {filename}", font=("Segoe UI", 9, "bold")).pack(anchor="w")
-                
-                # Información adicional
-                info_text = f"🌐 Idioma: {record.get('language', 'Desconocido')}"
-                if 'model' in record:
-                    info_text += f" · 🤖 Modelo: {record['model']}"
-                if 'duration' in record:
-                    info_text += f" · ⏱️ Duración: {record['duration']:.1f}s"
-                ttk.Label(frame, text=info_text, font=("Segoe UI", 9)).pack(anchor="w")
-                
-                # Botones de acción
-                btn_frame = ttk.Frame(frame)
-                btn_frame.pack(fill="x", pady=5)
-                
-                def make_view_cmd(text, segments):
-                    def cmd():
-                        self._show_full_transcript(text, segments)
-                    return cmd
-                
-                ttk.Button(btn_frame, text="🔍 Ver completo",
-                          command=make_view_cmd(record['text'], record['segments'])).pack(side="left", padx=2)
-                
-                if record['original_file'] and Path(record['original_file']).exists():
-                    def make_open_cmd(path):
-                        return lambda: os.startfile(path)
-                    
-                    ttk.Button(btn_frame, text="🎵 Abrir audio",
-                             command=make_open_cmd(record['original_file'])).pack(side="left", padx=2)
-                
-                ttk.Separator(frame, orient="horizontal").pack(fill="x", pady=10)
+            # El JSONL es cronológico: se lee al revés y solo se parsea lo
+            # que se va dibujando, por tandas para que la ventana responda
+            self._render_batch(scrollable_frame, self.history.newest_lines())
         
         except Exception as e:
             ttk.Label(scrollable_frame, 
@@ -109,6 +71,61 @@ class HistoryTab:
         ttk.Button(main_frame, text="🔄 Actualizar",
                   command=self._refresh_history).pack(pady=10)
 
+    def _render_batch(self, parent, lines):
+        """Dibujar una tanda de registros y programar la siguiente"""
+        # La vista pudo reconstruirse mientras esperábamos
+        if not parent.winfo_exists():
+            return
+        
+        batch = list(islice(lines, RENDER_BATCH_SIZE))
+        for line in batch:
+            # Una línea corrupta se salta; no corta el resto del historial
+            try:
+                record = self.history.parse(line)
+                self._add_record(parent, record)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning("Registro de historial inválido omitido: %s", e)
+        
+        if len(batch) == RENDER_BATCH_SIZE:
+            self.app.after_idle(self._render_batch, parent, lines)
+    
+    def _add_record(self, parent, record):
+        """Dibujar un registro del historial"""
+        # Frame para cada registro
+        frame = ttk.Frame(parent)
+        frame.pack(fill="x", padx=5, pady=5)
+        
+        # Fecha y archivo original
+        date_str = dt.datetime.fromtimestamp(record['date']).strftime("%Y-%m-%d %H:%M")
+        original_file = record.get('original_file')
+        filename = Path(original_file).name if original_file else 'Archivo desconocido'
+        
+        ttk.Label(frame, text=f"🕒 {date_str}", font=("Segoe UI", 9)).pack(anchor="w")
+        ttk.Label(frame, text=f"📄 {filename}", font=("Segoe UI", 9, "bold")).pack(anchor="w")
+        
+        # Información adicional
+        info_text = f"🌐 Idioma: {record.get('language', 'Desconocido')}"
+        if 'model' in record:
+            info_text += f" · 🤖 Modelo: {record['model']}"
+        if 'duration' in record:
+            info_text += f" · ⏱️ Duración: {record['duration']:.1f}s"
+        ttk.Label(frame, text=info_text, font=("Segoe UI", 9)).pack(anchor="w")
+        
+        # Botones de acción
+        btn_frame = ttk.Frame(frame)
+        btn_frame.pack(fill="x", pady=5)
+        
+        text = record.get('text', '')
+        segments = record.get('segments', [])
+        ttk.Button(btn_frame, text="🔍 Ver completo",
+                  command=lambda: self._show_full_transcript(text, segments)).pack(side="left", padx=2)
+        
+        if original_file and Path(original_file).exists():
+            ttk.Button(btn_frame, text="🎵 Abrir audio",
+                     command=lambda: self.app._open_external(os.startfile, original_file)).pack(side="left", padx=2)
+        
+        ttk.Separator(frame, orient="horizontal").pack(fill="x", pady=10)
+
     def _show_full_transcript(self, text, segments):
         """Mostrar transcripción completa en una ventana nueva"""
         window = tk.Toplevel(self.app)
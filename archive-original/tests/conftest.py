@@ -0,0 +1,9 @@
+"""
+Configuración de pytest para los módulos de archive-original
+"""
+
+import sys
+from pathlib import Path
+
+# core.py y whisper_gui.py son módulos sueltos, no un paquete
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,56 @@
+"""
+Tests para core.py
+"""
+
+import core
+from core import TranscriptionResult, _merge_chunk_results, budget_consume, budget_refund
+
+
+class TestMergeChunkResults:
+    """Tests para la unión de chunks de split_for_api"""
+
+    def test_offsets_follow_chunk_durations(self):
+        """Test que cada chunk se desplaza según la duración real de los anteriores"""
+        results = [
+            TranscriptionResult(text="Hola", segments=[{'start': 0.0, 'end': 4.0, 'text': 'Hola'}]),
+            TranscriptionResult(text="mundo", segments=[{'start': 10.0, 'end': 12.0, 'text': 'mundo'}]),
+            TranscriptionResult(text="adiós", segments=[{'start': 3.0, 'end': 5.0, 'text': 'adiós'}]),
+        ]
+
+        merged = _merge_chunk_results(results, [300.0, 845.0, 120.0], overlap=5)
+
+        assert [(s['start'], s['end']) for s in merged.segments] == [
+            (0.0, 4.0),
+            (305.0, 307.0),    # 300 - 5
+            (1138.0, 1140.0),  # (300 - 5) + (845 - 5)
+        ]
+        assert merged.text == "Hola mundo adiós"
+
+    def test_overlap_duplicates_dropped(self):
+        """Test que se descartan los segmentos del solapamiento inicial"""
+        results = [
+            TranscriptionResult(text="a", segments=[{'start': 0.0, 'end': 1.0, 'text': 'a'}]),
+            TranscriptionResult(text="b", segments=[{'start': 1.0, 'end': 1.5, 'text': 'b'}]),
+        ]
+
+        merged = _merge_chunk_results(results, [240.0, 240.0])
+
+        assert len(merged.segments) == 1
+
+
+class TestBudgetRefund:
+    """Tests para la devolución de reservas de presupuesto"""
+
+    def test_refund_same_day(self, tmp_path, monkeypatch):
+        """Test que la reserva se devuelve el mismo día"""
+        monkeypatch.setattr(core, "_budget_file", tmp_path / "budget.json")
+        day = budget_consume(0.5)
+        budget_refund(0.5, day)
+        assert core.budget_get_data()['consumed'] == 0.0
+
+    def test_refund_after_midnight_ignored(self, tmp_path, monkeypatch):
+        """Test que una reserva de ayer no descuenta del día nuevo"""
+        monkeypatch.setattr(core, "_budget_file", tmp_path / "budget.json")
+        budget_consume(0.2)
+        budget_refund(0.5, "2000-01-01")
+        assert core.budget_get_data()['consumed'] == 0.2
@@ -0,0 +1,28 @@
+"""
+Tests para el historial JSONL de whisper_gui
+"""
+
+import pytest
+
+import whisper_gui
+from whisper_gui import History
+
+
+class TestHistory:
+    """Tests para History"""
+
+    @pytest.mark.parametrize("block", [7, 64, 64 * 1024])
+    def test_newest_lines_reads_backwards(self, tmp_path, monkeypatch, block):
+        """Test que newest_lines devuelve del más reciente al más antiguo"""
+        monkeypatch.setattr(whisper_gui, "HISTORY_READ_BLOCK", block)
+        history = History(tmp_path / "history.jsonl")
+        for i in range(20):
+            history.append({"id": str(i), "date": i, "text": "x" * i})
+
+        ids = [history.parse(line)["id"] for line in history.newest_lines()]
+
+        assert ids == [str(i) for i in reversed(range(20))]
+
+    def test_newest_lines_missing_file(self, tmp_path):
+        """Test que un historial inexistente no devuelve líneas"""
+        assert list(History(tmp_path / "history.jsonl").newest_lines()) == []
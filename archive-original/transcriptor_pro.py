@@ -25,7 +25,7 @@ from concurrent.futures import ThreadPoolExecutor
 # CONSTANTES Y CONFIGURACIÓN GLOBAL
 # ============================================================================
 
-AUDIO_EXTENSIONS = {'.mp3', '.wav', '.m4a', '.flac', '.opus', '.ogg', '.aac', '.wma'}
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.flac', '.opus', '.ogg', '.aac', '.wma'})
 TEMP_DIRECTORY = Path(tempfile.gettempdir()) / "transcriptor_temp"
 TEMP_DIRECTORY.mkdir(exist_ok=True)
 
@@ -1342,8 +1342,8 @@ class TranscriptorProApp(tk.Tk):
                 out_srt.write_text(generate_srt(result), encoding="utf-8")
                 has_srt = True
 
-            self.after(0, lambda: self.result_text.delete("1.0", tk.END))
-            self.after(0, lambda: self.result_text.insert("1.0", result.text))
+            # Una sola llamada a Tk: replace = borrar + insertar
+            self.after(0, self.result_text.replace, "1.0", tk.END, result.text)
 
             consume_budget(cost)
 
@@ -1384,7 +1384,7 @@ class TranscriptorProApp(tk.Tk):
         outdir = Path(self.output_var.get())
         outdir.mkdir(parents=True, exist_ok=True)
 
-        files = [f for f in sorted(inbox.glob("*")) if f.suffix.lower() in AUDIO_EXTENSIONS]
+        files = sorted(f for f in inbox.glob("*") if f.suffix.lower() in AUDIO_EXTENSIONS)
         total_files = len(files)
 
         self._add_to_log(f"📁 Encontrados {total_files} archivos")
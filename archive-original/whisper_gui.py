@@ -5,37 +5,253 @@ Soporta: OpenAI, Groq y Whisper Local
 
 from __future__ import annotations
 import os
+import logging
+import logging.handlers
+import mmap
+import sys
 import tkinter as tk
 import uuid
+import webbrowser
 import time
 import json
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
+import queue
 import threading
 import datetime as dt
-import json
-from dataclasses import dataclass, asdict, field
-from typing import Optional
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, fields, replace
+from typing import Optional, List, Dict, Tuple
 
 # Importar core
 from core import (
     AUDIO_EXT, split_for_api, transcribe_file, write_srt,
     preprocess_vad_ffmpeg, estimate_cost, budget_set_limit,
-    budget_allow, budget_consume, probe_duration, MODEL_COSTS,
-    budget_get_remaining, get_provider_info, get_all_models_info,
-    PROVIDER_MAP
+    budget_allow, budget_consume, budget_refund, probe_duration, MODEL_COSTS,
+    budget_get_remaining, get_provider_info, get_all_models_info, MODEL_INFO,
+    PROVIDER_MAP, get_openai_client, get_groq_client, lookup_cached,
+    transcript_cache, APP_ROOT, make_work_dir, remove_work_dir, shutdown_api_pool,
+    atomic_write_bytes
 )
+from history_tab import HistoryTab
+
+logger = logging.getLogger(__name__)
 
-ROOT = Path(os.getenv("APPDATA", Path.home())) / ".whisper4"
+# orjson es opcional: mucho más rápido que json para historiales grandes
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_HOME = Path.home()  # expanduser() consulta el registro en Windows: resolver una vez
+ROOT = APP_ROOT  # APPDATA (o el home) / .whisper4, compartida con core
 DIR_TXT = ROOT / "transcripts"
 DIR_TXT.mkdir(parents=True, exist_ok=True)
 CONFIG_FILE = ROOT / "config.json"
+HISTORY_FILE = ROOT / "history.jsonl"  # Un registro JSON por línea (solo append)
+LOG_FILE = ROOT / "whisper_gui.log"
+
+# Última configuración leída/guardada: (st_mtime_ns de CONFIG_FILE, AppConfig)
+_CONFIG_CACHE: Optional[tuple[int, AppConfig]] = None
+
+# JSON compacto en disco; WHISPER_PRETTY_CONFIG=1 lo indenta para depurar
+PRETTY_JSON = bool(os.getenv("WHISPER_PRETTY_CONFIG"))
+
+# Archivos JSON mayores que esto se parsean desde un mmap (solo con orjson)
+MMAP_THRESHOLD = 64 * 1024
+
+# Tamaño de bloque al leer el historial hacia atrás desde el final
+HISTORY_READ_BLOCK = 64 * 1024
+
+# Archivos del lote transcritos a la vez (valor por defecto de batch_jobs)
+BATCH_WORKERS = 4
+# slots=True en dataclasses requiere Python 3.10+
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# ============================================================================
+# UTILIDADES JSON
+# ============================================================================
+
+def _json_dumps(obj) -> bytes:
+    """Serializar a JSON en UTF-8 (orjson si está disponible)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if PRETTY_JSON else None)
+    if PRETTY_JSON:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _json_loads(data: bytes):
+    """Parsear JSON desde bytes (orjson si está disponible)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _read_json_file(path: Path):
+    """Leer y parsear un archivo JSON, mapeándolo en memoria si es grande"""
+    if orjson is not None and path.stat().st_size > MMAP_THRESHOLD:
+        # orjson parsea directamente del buffer, sin copia intermedia
+        with open(path, 'rb') as f, \
+             mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+             memoryview(mm) as view:
+            return orjson.loads(view)
+    return _json_loads(path.read_bytes())
+
+def _json_line(obj) -> bytes:
+    """Serializar a una línea JSONL compacta terminada en salto de línea"""
+    if orjson is not None:
+        # El salto de línea lo añade orjson: sin copiar los bytes otra vez
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+
+# ============================================================================
+# HISTORIAL (JSON Lines)
+# ============================================================================
+
+def _config_embedded_history() -> list:
+    """Historial guardado dentro de config.json por versiones anteriores"""
+    if not CONFIG_FILE.exists():
+        return []
+    return _read_json_file(CONFIG_FILE).get('history') or []
+
+def _read_legacy_dir(history_dir: Path) -> list:
+    """Registros de la carpeta history/ (un JSON por transcripción)"""
+    # scandir reutiliza el stat de cada entrada (cacheado en Windows)
+    with os.scandir(history_dir) as it:
+        entries = [(e.stat().st_mtime, e) for e in it
+                   if e.name.endswith('.json') and e.is_file()]
+    entries.sort(key=lambda item: item[0])
+    
+    records = []
+    for mtime, entry in entries:
+        with open(entry.path, 'rb') as f:
+            transcript = _json_loads(f.read())
+        # Crear registro del historial
+        records.append({
+            "id": entry.name[:-len('.json')],  # Usar nombre del archivo como ID
+            "date": mtime,  # Fecha de modificación
+            "original_file": transcript.get("audio_file", ""),
+            "text": transcript.get("text", ""),
+            "segments": transcript.get("segments", []),
+            "language": transcript.get("language", "")
+        })
+    return records
+
+class History:
+    """Historial de transcripciones, separado de AppConfig"""
+    def __init__(self, path: Path = HISTORY_FILE):
+        self.path = path
+        # Workers y el hilo de Tk pueden añadir registros a la vez
+        self._lock = threading.Lock()
+    
+    def exists(self) -> bool:
+        """Si el archivo de historial ya existe"""
+        return self.path.exists()
+    
+    def append(self, record: dict):
+        """Añadir un registro sin reescribir los anteriores"""
+        line = _json_line(record)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'ab') as f:
+                f.write(line)
+    
+    def rewrite(self, records: list):
+        """Reemplazar el historial completo en una sola escritura"""
+        payload = b"".join(_json_line(r) for r in records)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Con el lock: un append concurrente no se pierde en el reemplazo
+        with self._lock:
+            atomic_write_bytes(self.path, payload)
+    
+    def migrate_legacy(self, legacy_dirs):
+        """Importar una sola vez el historial de versiones anteriores
+        
+        En cada carpeta de `legacy_dirs` se busca history.json (una lista)
+        o, si no existe, la carpeta history/ con un JSON por transcripción.
+        Lo importado se renombra a *.migrated. La lista 'history' de
+        config.json solo se lee mientras no exista history.jsonl.
+        """
+        first_run = not self.exists()
+        records = _config_embedded_history() if first_run else []
+        sources = []
+        # ROOT y la carpeta de output_dir suelen coincidir: leer cada una una vez
+        for folder in dict.fromkeys(Path(d).resolve() for d in legacy_dirs):
+            legacy_file = folder / "history.json"
+            legacy_dir = folder / "history"
+            if legacy_file.exists():
+                records.extend(_read_json_file(legacy_file))
+                sources.append(legacy_file)
+            elif legacy_dir.is_dir():
+                records.extend(_read_legacy_dir(legacy_dir))
+            if legacy_dir.is_dir():
+                sources.append(legacy_dir)  # También si history.json la sustituía
+        if not first_run and not sources:
+            return
+        
+        current = [] if first_run else list(self)
+        known = {r.get('id') for r in current}
+        new = []
+        for r in records:
+            if r.get('id') not in known:
+                known.add(r.get('id'))
+                new.append(r)
+        if first_run or new:
+            # Se crea aunque esté vacío: su existencia marca la migración
+            # como hecha. En orden de fecha: newest_lines() no ordena
+            self.rewrite(sorted(current + new, key=lambda r: r.get('date', 0)))
+        # Renombrar: la conversión no se repite en el siguiente arranque
+        for src in sources:
+            os.replace(src, src.with_name(src.name + ".migrated"))
+        if new:
+            logger.info("Se migraron %d transcripciones al historial", len(new))
+    
+    def newest_lines(self):
+        """Líneas del más reciente al más antiguo, sin parsear (ver parse)
+        
+        Se lee hacia atrás desde el final en bloques: las primeras tandas
+        cuestan lo mismo aunque el historial sea muy grande.
+        """
+        try:
+            end = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        tail = b""
+        while end > 0:
+            start = max(0, end - HISTORY_READ_BLOCK)
+            # Reabrir por bloque: el generador vive entre tandas de Tk y un
+            # handle abierto impediría el os.replace de rewrite() en Windows
+            with open(self.path, 'rb') as f:
+                f.seek(start)
+                block = f.read(end - start)
+            end = start
+            lines = (block + tail).split(b"\n")
+            tail = lines[0]  # Puede estar cortada: se completa con el bloque anterior
+            for line in reversed(lines[1:]):
+                if line.strip():
+                    yield line
+        if tail.strip():
+            yield tail
+    
+    @staticmethod
+    def parse(line: bytes) -> dict:
+        """Parsear una línea del historial"""
+        return _json_loads(line)
+    
+    def __iter__(self):
+        """Leer el historial registro a registro"""
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield _json_loads(line)
 
 # ============================================================================
 # CONFIGURACIÓN
 # ============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AppConfig:
     """Configuración de la aplicación v3"""
     # Modelo y proveedor
@@ -49,99 +265,184 @@ class AppConfig:
     bitrate: int = 192
     use_vad: bool = False  # DESACTIVADO por defecto (consume mucha CPU)
     export_srt: bool = True
-    output_dir: str = str(DIR_TXT)  # Directorio de salida personalizable
-    
-    # Historial
-    history: list[dict] = field(default_factory=list)  # Lista de registros de transcripción
+    batch_jobs: int = BATCH_WORKERS  # Archivos del lote en paralelo
+    # Por defecto ~/IAAudio/OUT: historial y transcripciones cuelgan de su carpeta padre
+    output_dir: str = field(default_factory=lambda: str(_HOME / "IAAudio" / "OUT"))
     
     # Presupuesto
     daily_budget: float = 2.0
     
     # Directorios
-    inbox_dir: str = str(Path.home() / "IAAudio" / "INBOX")
-    output_dir: str = str(Path.home() / "IAAudio" / "OUT")
+    inbox_dir: str = field(default_factory=lambda: str(_HOME / "IAAudio" / "INBOX"))
     
     def save(self):
         """Guardar configuración"""
+        global _CONFIG_CACHE
         try:
             # Asegurar que el directorio existe
             CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
             
-            # Guardar con formato bonito
-            config_data = asdict(self)
+            # Conversión superficial: asdict() haría deepcopy de cada valor
+            config_data = {f.name: getattr(self, f.name) for f in fields(self)}
             
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
+            # Serializar de una vez; un corte a mitad no deja el archivo truncado
+            atomic_write_bytes(CONFIG_FILE, _json_dumps(config_data))
+            _CONFIG_CACHE = (CONFIG_FILE.stat().st_mtime_ns, replace(self))
             
-            print(f"✓ Configuración guardada en: {CONFIG_FILE}")
+            logger.debug("Configuración guardada en: %s", CONFIG_FILE)
             
         except Exception as e:
-            print(f"✗ Error guardando configuración: {e}")
+            logger.error("Error guardando configuración: %s", e)
             raise
     
     @classmethod
     def load(cls) -> AppConfig:
-        """Cargar configuración"""
+        """Cargar configuración (cacheada mientras el archivo no cambie)"""
+        global _CONFIG_CACHE
         try:
             if CONFIG_FILE.exists():
-                print(f"✓ Cargando configuración desde: {CONFIG_FILE}")
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Filtrar solo campos válidos
-                    valid_fields = {k: v for k, v in data.items() 
-                                  if k in cls.__dataclass_fields__}
-                    
-                    print(f"✓ Configuración cargada: {len(valid_fields)} campos")
-                    if 'groq_api_key' in valid_fields and valid_fields['groq_api_key']:
-                        print(f"  - Groq API key: {len(valid_fields['groq_api_key'])} caracteres")
-                    if 'openai_api_key' in valid_fields and valid_fields['openai_api_key']:
-                        print(f"  - OpenAI API key: {len(valid_fields['openai_api_key'])} caracteres")
-                    
-                    # Migrar historial existente si no existe aún
-                    app_path = CONFIG_FILE.parent
-                    history_path = app_path / "history"
-                    if not (app_path / "history.json").exists():
-                        print("Migrando transcripciones existentes al historial...")
-                        if history_path.exists() and history_path.is_dir():
-                            history_records = []
-                            try:
-                                for json_file in history_path.glob("*.json"):
-                                    with open(json_file, 'r', encoding='utf-8') as f:
-                                        transcript = json.load(f)
-                                        # Crear registro del historial
-                                        record = {
-                                            "id": json_file.stem,  # Usar nombre del archivo como ID
-                                            "date": json_file.stat().st_mtime,  # Fecha de modificación
-                                            "original_file": transcript.get("audio_file", ""),
-                                            "text": transcript.get("text", ""),
-                                            "segments": transcript.get("segments", []),
-                                            "language": transcript.get("language", "")
-                                        }
-                                        history_records.append(record)
-                                
-                                # Guardar historial
-                                if history_records:
-                                    with open(app_path / "history.json", 'w', encoding='utf-8') as f:
-                                        json.dump(history_records, f, ensure_ascii=False, indent=2)
-                                        print(f"✓ Se migraron {len(history_records)} transcripciones al historial")
-                            except Exception as e:
-                                print(f"✗ Error migrando transcripciones: {e}")
-                                # Continuar aunque haya error
-                    
-                    return cls(**valid_fields)
+                mtime_ns = CONFIG_FILE.stat().st_mtime_ns
+                if _CONFIG_CACHE is not None and _CONFIG_CACHE[0] == mtime_ns:
+                    return replace(_CONFIG_CACHE[1])
+                
+                logger.debug("Cargando configuración desde: %s", CONFIG_FILE)
+                data = _read_json_file(CONFIG_FILE)
+                # Filtrar solo campos válidos
+                valid_names = cls.__dataclass_fields__.keys()
+                valid_fields = {k: v for k, v in data.items() if k in valid_names}
+                
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Configuración cargada: %d campos", len(valid_fields))
+                    if valid_fields.get('groq_api_key'):
+                        logger.debug("  - Groq API key: %d caracteres", len(valid_fields['groq_api_key']))
+                    if valid_fields.get('openai_api_key'):
+                        logger.debug("  - OpenAI API key: %d caracteres", len(valid_fields['openai_api_key']))
+                
+                config = cls(**valid_fields)
+                _CONFIG_CACHE = (mtime_ns, replace(config))
+                return config
             else:
-                print(f"⚠ No existe config en {CONFIG_FILE}, usando valores por defecto")
+                logger.debug("No existe config en %s, usando valores por defecto", CONFIG_FILE)
         except Exception as e:
-            print(f"⚠ Error cargando configuración: {e}")
+            logger.warning("Error cargando configuración: %s", e)
         
-        print("✓ Usando configuración por defecto")
+        logger.debug("Usando configuración por defecto")
         return cls()
 
 # ============================================================================
 # APLICACIÓN PRINCIPAL
 # ============================================================================
 
+def _list_audio(inbox: Path) -> List[Path]:
+    """Archivos de audio de la bandeja, filtrados durante el scandir"""
+    try:
+        with os.scandir(inbox) as it:
+            paths = [e.path for e in it
+                     if os.path.splitext(e.name)[1].lower() in AUDIO_EXT and e.is_file()]
+    except FileNotFoundError:
+        return []
+    # Orden estable (registro y reparto del presupuesto), pero solo sobre los
+    # ya filtrados y comparando str, no Path
+    paths.sort()
+    return [Path(x) for x in paths]
+
+def _output_bases(files: List[Path], outdir: Path) -> List[Path]:
+    """Ruta de salida (sin extensión) de cada archivo del lote
+    
+    Los workers escriben a la vez: talk.mp3 y talk.wav no pueden compartir
+    talk.txt, así que a los nombres repetidos se les añade su extensión.
+    """
+    # casefold: en Windows/macOS Talk.txt y talk.txt son el mismo archivo
+    counts = Counter(p.stem.casefold() for p in files)
+    return [outdir / (p.stem if counts[p.stem.casefold()] == 1
+                      else f"{p.stem}_{p.suffix[1:].lower()}")
+            for p in files]
+
+def _prepare_batch_file(p: Path, config: AppConfig,
+                        work_dir: Path) -> Tuple[Path, List[Path], List[float]]:
+    """VAD + troceado de un archivo del lote (la parte de CPU/ffmpeg)"""
+    src = preprocess_vad_ffmpeg(p, work_dir) if config.use_vad else p
+    parts, durations = split_for_api(src, bitrate_kbps=config.bitrate, work_dir=work_dir,
+                                     encoded=src != p)
+    return src, parts, durations
+
+class _Prefetcher:
+    """Preprocesa el siguiente archivo del lote mientras se sube el actual"""
+    
+    def __init__(self, files: List[Path], config: AppConfig, workers: int):
+        self._files = files
+        self._config = config
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper-prep")
+        self._futures: Dict[int, Future] = {}
+        # Temporales propios de cada archivo: lotes en paralelo no se pisan
+        self._work_dirs: Dict[int, Path] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, i: int) -> Optional[Future]:
+        """Futuro del preprocesado del archivo i (lo lanza si aún no existe)"""
+        if i >= len(self._files):
+            return None
+        with self._lock:
+            fut = self._futures.get(i)
+            if fut is None:
+                work_dir = self._work_dirs[i] = make_work_dir()
+                fut = self._futures[i] = self._pool.submit(
+                    _prepare_batch_file, self._files[i], self._config, work_dir)
+            return fut
+    
+    def release(self, i: int):
+        """Borrar los temporales del archivo i (ya subido o descartado)"""
+        with self._lock:
+            work_dir = self._work_dirs.pop(i, None)
+        if work_dir is not None:
+            remove_work_dir(work_dir)
+    
+    def shutdown(self):
+        """Liberar los hilos y los temporales de lo que nadie llegó a usar"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            pending = list(self._work_dirs.items())
+            self._work_dirs.clear()
+        # Los que aún corren se borran al terminar, no a mitad de escritura
+        for i, work_dir in pending:
+            self._futures[i].add_done_callback(lambda _, d=work_dir: remove_work_dir(d))
+
+# Escrituras de exportación (SRT) fuera del camino crítico del worker
+_IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="whisper-io")
+# Segundos que el cierre espera a las exportaciones pendientes
+CLOSE_WRITE_TIMEOUT = 5
+
+def _write_srt_file(path: Path, result) -> Future:
+    """Formatear y guardar el SRT en segundo plano"""
+    def on_done(f: Future):
+        if f.exception() is not None:
+            logger.error("Error guardando %s: %s", path, f.exception())
+    
+    fut = _IO_POOL.submit(lambda: path.write_bytes(write_srt(result).encode("utf-8")))
+    fut.add_done_callback(on_done)
+    return fut
+
+# Etiqueta del proveedor por modelo, para los mensajes de resultado
+_PROVIDER_LABELS = {model: provider.upper() for model, provider in PROVIDER_MAP.items()}
+
+# Conversión por anotación del campo (son cadenas por `from __future__ import annotations`)
+_FIELD_CASTS = {'int': int, 'float': float, 'bool': bool, 'str': str}
+
 class App(tk.Tk):
+    # Variable Tk -> campo de AppConfig
+    _CONFIG_BINDINGS: tuple[tuple[str, str], ...] = (
+        ("model_var", "model"),
+        ("openai_key_var", "openai_api_key"),
+        ("groq_key_var", "groq_api_key"),
+        ("br_var", "bitrate"),
+        ("vad_var", "use_vad"),
+        ("srt_var", "export_srt"),
+        ("jobs_var", "batch_jobs"),
+        ("budget_var", "daily_budget"),
+        ("inbox_var", "inbox_dir"),
+        ("out_var", "output_dir"),
+    )
+    
     def __init__(self):
         super().__init__()
         self.title("IA Audio v3.0 – Multi-Provider Edition 🚀")
@@ -149,12 +450,58 @@ class App(tk.Tk):
         self.minsize(900, 600)
         
         self.config = AppConfig.load()
+        self.history = History()
+        # Carpeta de transcripciones; se recalcula solo si cambia output_dir
+        self._output_dir = self.config.output_dir
+        self._transcriptions_dir = Path(self._output_dir).parent / "transcripciones"
+        try:
+            # Versiones anteriores lo guardaban en ROOT o junto a output_dir
+            self.history.migrate_legacy((ROOT, self._transcriptions_dir.parent))
+        except Exception as e:
+            logger.error("Error migrando el historial anterior: %s", e)
         self.audio: Optional[Path] = None
+        self.audio_duration: Optional[int] = None
+        
+        # Workers persistentes; los hilos nunca tocan Tk, encolan callbacks
+        # que se ejecutan en el hilo principal desde _poll_future
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="whisper")
+        # Guardados de config/presupuesto: en orden, sin esperar a una
+        # transcripción, y se terminan antes de cerrar
+        self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper-save")
+        self._ui_q: queue.Queue = queue.Queue()
+        # Progreso (actual, total, mensaje); se vuelca cada 50 ms en el hilo de Tk
+        self._progress_q: queue.Queue = queue.Queue()
+        # Líneas del log de lotes; se insertan de golpe cada 50 ms
+        self._log_q: queue.Queue = queue.Queue()
+        
+        # Lote: pool acotado propio y futuros pendientes (para cancelar)
+        self._batch_pool: Optional[ThreadPoolExecutor] = None
+        self._batch_futures: List[Future] = []
+        self._batch_prefetch: Optional[_Prefetcher] = None
+        # SRT en escritura; se esperan al cerrar
+        self._pending_writes: List[Future] = []
+        self._writes_lock = threading.Lock()
+        self._budget_lock = threading.Lock()
+        # Al cerrar la ventana los workers dejan de empezar archivos y chunks
+        self._closing = threading.Event()
+        
+        # Autoguardado con debounce: ráfagas de cambios -> una sola escritura
+        self._save_pending = None
+        self._applying_config = False
+        # Igual para redibujar el historial tras varias escrituras seguidas
+        self._refresh_pending = None
         
         self._build_ui()
         
+        for var in (self.model_var, self.br_var, self.vad_var, self.srt_var,
+                    self.jobs_var, self.budget_var, self.inbox_var, self.out_var):
+            var.trace_add("write", self._schedule_save)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        
         # Aplicar config DESPUÉS de crear todos los widgets
         self.after(100, self._apply_config_to_ui)
+        self.after(50, self._drain_progress_queue)
+        self.after(50, self._drain_log_queue)
         
         # Mostrar info de ahorro solo si es primera vez o usa OpenAI
         self.after(1000, self._show_savings_tip)
@@ -181,13 +528,22 @@ class App(tk.Tk):
         self.tab_compare = ttk.Frame(nb)
         nb.add(self.tab_compare, text="💰 Comparador de Costes")
         
+        # Las variables de configuración existen siempre; los widgets de
+        # Configuración y Comparador se construyen al abrir la pestaña
+        self._init_config_vars()
+        self.lbl_model_info: Optional[ttk.Label] = None
+        self.lbl_budget_status: Optional[ttk.Label] = None
+        
         self._build_single_tab()
         self._build_batch_tab()
-        self._build_config_tab()
-        self._build_compare_tab()
+        
+        self._lazy_tabs = {
+            str(self.tab_config): self._build_config_tab,
+            str(self.tab_compare): self._build_compare_tab,
+        }
+        nb.bind("<<NotebookTabChanged>>", self._on_tab_change)
         
         # Crear pestaña de historial
-        from history_tab import HistoryTab
         self.history_tab = HistoryTab(self)
         
         # Barra de estado
@@ -200,6 +556,26 @@ class App(tk.Tk):
         self.status_bar = ttk.Label(self, text=status_text, 
                                    relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Barra de progreso única; se muestra solo durante una transcripción
+        self._status_progress = ttk.Progressbar(self.status_bar, mode='determinate', length=200)
+    
+    def _init_config_vars(self):
+        """Crear las variables Tk de la pestaña de configuración"""
+        self.model_var = tk.StringVar(value=self.config.model)
+        self.openai_key_var = tk.StringVar(value=self.config.openai_api_key)
+        self.groq_key_var = tk.StringVar(value=self.config.groq_api_key)
+        self.br_var = tk.IntVar(value=self.config.bitrate)
+        self.vad_var = tk.BooleanVar(value=self.config.use_vad)
+        self.srt_var = tk.BooleanVar(value=self.config.export_srt)
+        self.jobs_var = tk.IntVar(value=self.config.batch_jobs)
+        self.budget_var = tk.DoubleVar(value=self.config.daily_budget)
+    
+    def _on_tab_change(self, event):
+        """Construir una pestaña diferida la primera vez que se abre"""
+        builder = self._lazy_tabs.pop(event.widget.select(), None)
+        if builder is not None:
+            builder()
     
     def _build_single_tab(self):
         """Tab de archivo único"""
@@ -277,6 +653,9 @@ class App(tk.Tk):
         self.batch_btn = ttk.Button(btn_frame, text="▶️ Procesar carpeta", 
                   command=self._run_batch)
         self.batch_btn.pack(side="left", padx=2)
+        self.batch_cancel_btn = ttk.Button(btn_frame, text="⏹️ Cancelar", 
+                  command=self._cancel_batch, state="disabled")
+        self.batch_cancel_btn.pack(side="left", padx=2)
         
         # Progreso
         self.batch_progress = ttk.Progressbar(self.tab_batch, mode='determinate')
@@ -289,8 +668,10 @@ class App(tk.Tk):
         log_scroll = ttk.Scrollbar(log_frame)
         log_scroll.pack(side="right", fill="y")
         
+        # Solo lectura y sin pila de deshacer: el log solo crece por _flush_log
         self.log_text = tk.Text(log_frame, wrap="word", 
                                font=("Consolas", 9),
+                               undo=False, autoseparators=False, state="disabled",
                                yscrollcommand=log_scroll.set)
         self.log_text.pack(side="left", fill="both", expand=True)
         log_scroll.config(command=self.log_text.yview)
@@ -323,8 +704,6 @@ class App(tk.Tk):
         
         ttk.Label(section1, text="Modelo:").grid(row=0, column=0, sticky="w", pady=5)
         
-        self.model_var = tk.StringVar(value=self.config.model)
-        
         # Crear combobox con info de cada modelo
         model_options = list(MODEL_COSTS.keys())
         self.model_combo = ttk.Combobox(section1, textvariable=self.model_var, 
@@ -341,14 +720,12 @@ class App(tk.Tk):
         section2.pack(fill="x", pady=10)
         
         ttk.Label(section2, text="OpenAI API Key:").grid(row=0, column=0, sticky="w", pady=5)
-        self.openai_key_var = tk.StringVar(value=self.config.openai_api_key)
         openai_entry = ttk.Entry(section2, textvariable=self.openai_key_var, width=50, show="*")
         openai_entry.grid(row=0, column=1, sticky="w", pady=5, padx=5)
         ttk.Button(section2, text="👁️", width=3,
                   command=lambda: self._toggle_password(openai_entry)).grid(row=0, column=2)
         
         ttk.Label(section2, text="Groq API Key:").grid(row=1, column=0, sticky="w", pady=5)
-        self.groq_key_var = tk.StringVar(value=self.config.groq_api_key)
         groq_entry = ttk.Entry(section2, textvariable=self.groq_key_var, width=50, show="*")
         groq_entry.grid(row=1, column=1, sticky="w", pady=5, padx=5)
         ttk.Button(section2, text="👁️", width=3,
@@ -370,25 +747,25 @@ class App(tk.Tk):
         section3.pack(fill="x", pady=10)
         
         ttk.Label(section3, text="Bitrate (kbps):").grid(row=0, column=0, sticky="w", pady=5)
-        self.br_var = tk.IntVar(value=self.config.bitrate)
         ttk.Spinbox(section3, from_=64, to=320, increment=16, 
                    textvariable=self.br_var, width=10).grid(row=0, column=1, sticky="w", pady=5)
         
-        self.vad_var = tk.BooleanVar(value=self.config.use_vad)
         vad_check = ttk.Checkbutton(section3, text="VAD (recortar silencios) ⚠️ Consume mucha CPU", 
                        variable=self.vad_var)
         vad_check.grid(row=1, column=0, columnspan=2, sticky="w", pady=5)
         
-        self.srt_var = tk.BooleanVar(value=self.config.export_srt)
         ttk.Checkbutton(section3, text="Exportar subtítulos (SRT)", 
                        variable=self.srt_var).grid(row=2, column=0, columnspan=2, sticky="w", pady=5)
         
+        ttk.Label(section3, text="Archivos en paralelo (lotes):").grid(row=3, column=0, sticky="w", pady=5)
+        ttk.Spinbox(section3, from_=1, to=16, 
+                   textvariable=self.jobs_var, width=10).grid(row=3, column=1, sticky="w", pady=5)
+        
         # === PRESUPUESTO ===
         section4 = ttk.LabelFrame(frame, text="💰 Control de Presupuesto", padding=15)
         section4.pack(fill="x", pady=10)
         
         ttk.Label(section4, text="Límite diario (USD):").grid(row=0, column=0, sticky="w", pady=5)
-        self.budget_var = tk.DoubleVar(value=self.config.daily_budget)
         ttk.Entry(section4, textvariable=self.budget_var, width=15).grid(row=0, column=1, 
                                                                          sticky="w", pady=5)
         
@@ -403,6 +780,8 @@ class App(tk.Tk):
                   command=self._reset_config).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="🧪 Probar conexión API", 
                   command=self._test_api_connection).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="🗑️ Vaciar caché", 
+                  command=self._clear_transcript_cache).pack(side="left", padx=5)
         
         # Actualizar info inicial
         self._update_model_info()
@@ -426,8 +805,6 @@ class App(tk.Tk):
         self.compare_duration_var = tk.IntVar(value=60)
         ttk.Spinbox(input_frame, from_=1, to=600, textvariable=self.compare_duration_var, 
                    width=10).pack(side="left", padx=5)
-        ttk.Button(input_frame, text="🔄 Calcular", 
-                  command=self._update_comparison).pack(side="left", padx=5)
         
         # Tabla de comparación
         columns = ("Modelo", "Proveedor", "Coste", "Ahorro vs OpenAI", "API Key")
@@ -459,7 +836,9 @@ class App(tk.Tk):
         self.lbl_savings = ttk.Label(summary_frame, text="", font=("Segoe UI", 10))
         self.lbl_savings.pack(anchor="w", pady=2)
         
-        # Cargar comparación inicial
+        # Filas fijas: al cambiar la duración solo se recalcula el coste
+        self._fill_comparison()
+        self.compare_duration_var.trace_add("write", lambda *_: self._update_comparison())
         self._update_comparison()
     
     # ========================================================================
@@ -468,24 +847,11 @@ class App(tk.Tk):
     
     def _apply_config_to_ui(self):
         """Aplicar configuración cargada a la UI"""
-        if hasattr(self, 'model_var'):
-            self.model_var.set(self.config.model)
-        if hasattr(self, 'openai_key_var'):
-            self.openai_key_var.set(self.config.openai_api_key)
-        if hasattr(self, 'groq_key_var'):
-            self.groq_key_var.set(self.config.groq_api_key)
-        if hasattr(self, 'br_var'):
-            self.br_var.set(self.config.bitrate)
-        if hasattr(self, 'vad_var'):
-            self.vad_var.set(self.config.use_vad)
-        if hasattr(self, 'srt_var'):
-            self.srt_var.set(self.config.export_srt)
-        if hasattr(self, 'budget_var'):
-            self.budget_var.set(self.config.daily_budget)
-        if hasattr(self, 'inbox_var'):
-            self.inbox_var.set(self.config.inbox_dir)
-        if hasattr(self, 'out_var'):
-            self.out_var.set(self.config.output_dir)
+        self._applying_config = True
+        try:
+            self._set_config_vars()
+        finally:
+            self._applying_config = False
         
         # Configurar variables de entorno
         if self.config.openai_api_key:
@@ -493,17 +859,91 @@ class App(tk.Tk):
         if self.config.groq_api_key:
             os.environ['GROQ_API_KEY'] = self.config.groq_api_key
     
+    def _set_config_vars(self):
+        """Volcar self.config en las variables Tk"""
+        for var_name, cfg_name in self._CONFIG_BINDINGS:
+            var = getattr(self, var_name, None)
+            if var is not None:
+                var.set(getattr(self.config, cfg_name))
+    
+    def _schedule_save(self, *_):
+        """Reprogramar el autoguardado 2 s después del último cambio"""
+        if self._applying_config:
+            return
+        if self._save_pending:
+            self.after_cancel(self._save_pending)
+        self._save_pending = self.after(2000, self._flush_save)
+    
+    def _schedule_history_refresh(self):
+        """Redibujar el historial 250 ms después de la última escritura"""
+        if self._refresh_pending:
+            self.after_cancel(self._refresh_pending)
+        self._refresh_pending = self.after(250, self._flush_history_refresh)
+    
+    def _flush_history_refresh(self):
+        """Redibujar el historial programado"""
+        self._refresh_pending = None
+        self.history_tab._refresh_history()
+    
+    def _on_close(self):
+        """Guardar cambios pendientes y cerrar
+        
+        Los trabajos en marcha se cancelan: el proceso solo espera a que
+        terminen los chunks que ya se están subiendo, no el resto del audio.
+        """
+        self._closing.set()
+        if self._save_pending:
+            self.after_cancel(self._save_pending)
+            self._save_pending = None
+            try:
+                self._update_config_from_ui()
+            except (tk.TclError, ValueError) as e:
+                logger.error("Error guardando configuración al cerrar: %s", e)
+            else:
+                self._submit_save(replace(self.config))
+        if self._batch_pool is not None:
+            self._batch_pool.shutdown(wait=False, cancel_futures=True)
+        if self._batch_prefetch is not None:
+            self._batch_prefetch.shutdown()
+        shutdown_api_pool()
+        with self._writes_lock:
+            pending_writes = list(self._pending_writes)
+        wait(pending_writes, timeout=CLOSE_WRITE_TIMEOUT)
+        _IO_POOL.shutdown(wait=False, cancel_futures=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        # Los guardados ya encolados se completan: son escrituras pequeñas
+        self._save_executor.shutdown(wait=True)
+        self.destroy()
+    
+    def _flush_save(self):
+        """Guardar la configuración en segundo plano"""
+        self._save_pending = None
+        try:
+            self._update_config_from_ui()
+        except (tk.TclError, ValueError):
+            return  # Valor a medio escribir; el siguiente cambio reprograma
+        # Copia: el worker escribe mientras la UI sigue editando self.config
+        self._submit_save(replace(self.config))
+    
+    def _submit_save(self, snapshot: AppConfig):
+        """Encolar el guardado de la config y del límite de presupuesto"""
+        def save():
+            try:
+                snapshot.save()
+            finally:
+                budget_set_limit(snapshot.daily_budget)
+        self._save_executor.submit(save)
+    
     def _update_config_from_ui(self):
         """Actualizar configuración desde la UI"""
-        self.config.model = self.model_var.get()
-        self.config.openai_api_key = self.openai_key_var.get()
-        self.config.groq_api_key = self.groq_key_var.get()
-        self.config.bitrate = int(self.br_var.get())
-        self.config.use_vad = self.vad_var.get()
-        self.config.export_srt = self.srt_var.get()
-        self.config.daily_budget = float(self.budget_var.get())
-        self.config.inbox_dir = self.inbox_var.get()
-        self.config.output_dir = self.out_var.get()
+        field_types = AppConfig.__dataclass_fields__
+        for var_name, cfg_name in self._CONFIG_BINDINGS:
+            cast = _FIELD_CASTS[field_types[cfg_name].type]
+            setattr(self.config, cfg_name, cast(getattr(self, var_name).get()))
+        
+        if self.config.output_dir != self._output_dir:
+            self._output_dir = self.config.output_dir
+            self._transcriptions_dir = Path(self._output_dir).parent / "transcripciones"
         
         # Configurar variables de entorno para las APIs
         if self.config.openai_api_key:
@@ -513,50 +953,69 @@ class App(tk.Tk):
     
     def _save_config(self):
         """Guardar configuración"""
+        # Actualizar config desde UI
         try:
-            # Actualizar config desde UI
             self._update_config_from_ui()
-            
-            # Validar que al menos una API key esté configurada si no es modo local
-            if not self.config.model.startswith('local'):
-                if not self.config.openai_api_key and not self.config.groq_api_key:
-                    messagebox.showwarning(
-                        "Advertencia",
-                        "No has configurado ninguna API key.\n\n"
-                        "Necesitas al menos una para transcribir:\n"
-                        "- Groq API (recomendado, 98% más barato)\n"
-                        "- OpenAI API\n\n"
-                        "¿Continuar guardando de todas formas?"
-                    )
-            
-            # Guardar
-            self.config.save()
-            budget_set_limit(self.config.daily_budget)
-            
-            # Actualizar barra de estado
-            status_text = "Configuración guardada"
-            if self.config.groq_api_key:
-                status_text += " · Groq configurado ✓"
-            if self.config.openai_api_key:
-                status_text += " · OpenAI configurado ✓"
-            self.status_bar.config(text=status_text)
-            
-            # Mensaje de éxito con detalles
-            details = "✅ Configuración guardada correctamente\n\n"
-            details += f"Modelo: {self.config.model}\n"
-            if self.config.groq_api_key:
-                details += f"Groq API: Configurada ({len(self.config.groq_api_key)} caracteres)\n"
-            if self.config.openai_api_key:
-                details += f"OpenAI API: Configurada ({len(self.config.openai_api_key)} caracteres)\n"
-            details += f"Presupuesto: ${self.config.daily_budget}/día\n"
-            
-            messagebox.showinfo("Éxito", details)
-            self._update_budget_status()
-            
+        except (tk.TclError, ValueError) as e:
+            messagebox.showerror("Error", f"Valor de configuración no válido:\n{e}")
+            return
+        if self._save_pending:
+            self.after_cancel(self._save_pending)
+            self._save_pending = None
+        
+        # Validar que al menos una API key esté configurada si no es modo local
+        if not self.config.model.startswith('local'):
+            if not self.config.openai_api_key and not self.config.groq_api_key:
+                messagebox.showwarning(
+                    "Advertencia",
+                    "No has configurado ninguna API key.\n\n"
+                    "Necesitas al menos una para transcribir:\n"
+                    "- Groq API (recomendado, 98% más barato)\n"
+                    "- OpenAI API\n\n"
+                    "¿Continuar guardando de todas formas?"
+                )
+        
+        # Escritura y mensaje en segundo plano; Tk solo muestra el resultado
+        fut = self._save_executor.submit(self._do_save_config, replace(self.config))
+        self.after(50, self._poll_future, fut, lambda: self._on_config_saved(fut))
+    
+    @staticmethod
+    def _do_save_config(config: AppConfig):
+        """Guardar (en un worker); devuelve ("ok", detalles) o ("err", mensaje)"""
+        try:
+            config.save()
+            budget_set_limit(config.daily_budget)
         except Exception as e:
-            messagebox.showerror("Error", f"No se pudo guardar la configuración:\n{e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("No se pudo guardar la configuración")
+            return "err", f"No se pudo guardar la configuración:\n{e}"
+        
+        # Mensaje de éxito con detalles
+        details = "✅ Configuración guardada correctamente\n\n"
+        details += f"Modelo: {config.model}\n"
+        if config.groq_api_key:
+            details += f"Groq API: Configurada ({len(config.groq_api_key)} caracteres)\n"
+        if config.openai_api_key:
+            details += f"OpenAI API: Configurada ({len(config.openai_api_key)} caracteres)\n"
+        details += f"Presupuesto: ${config.daily_budget}/día\n"
+        return "ok", details
+    
+    def _on_config_saved(self, fut: Future):
+        """Mostrar el resultado del guardado (hilo de Tk)"""
+        status, message = fut.result()
+        if status != "ok":
+            messagebox.showerror("Error", message)
+            return
+        
+        # Actualizar barra de estado
+        status_text = "Configuración guardada"
+        if self.config.groq_api_key:
+            status_text += " · Groq configurado ✓"
+        if self.config.openai_api_key:
+            status_text += " · OpenAI configurado ✓"
+        self.status_bar.config(text=status_text)
+        
+        messagebox.showinfo("Éxito", message)
+        self._update_budget_status()
     
     def _reset_config(self):
         """Restaurar configuración por defecto"""
@@ -565,6 +1024,15 @@ class App(tk.Tk):
             self._apply_config_to_ui()
             messagebox.showinfo("Configuración", "✓ Valores restaurados")
     
+    def _clear_transcript_cache(self):
+        """Vaciar la caché de transcripciones"""
+        if messagebox.askyesno("Confirmar", "¿Vaciar la caché de transcripciones?"):
+            try:
+                transcript_cache.clear()
+                messagebox.showinfo("Caché", "✓ Caché vaciada")
+            except Exception as e:
+                messagebox.showerror("Error", f"No se pudo vaciar la caché: {e}")
+    
     def _on_model_change(self, event=None):
         """Cuando cambia el modelo seleccionado"""
         self._update_model_info()
@@ -572,7 +1040,7 @@ class App(tk.Tk):
     def _update_model_info(self):
         """Actualizar información del modelo seleccionado"""
         model = self.model_var.get()
-        info = get_provider_info(model)
+        info = MODEL_INFO.get(model) or get_provider_info(model)
         
         cost_hour = info['cost_per_hour']
         provider = info['provider'].upper()
@@ -589,10 +1057,13 @@ class App(tk.Tk):
         if info['requires_api_key']:
             text += " (requiere API key)"
         
-        self.lbl_model_info.config(text=text)
+        if self.lbl_model_info is not None:
+            self.lbl_model_info.config(text=text)
     
     def _update_budget_status(self):
         """Actualizar estado del presupuesto"""
+        if self.lbl_budget_status is None:
+            return  # Pestaña de configuración aún sin construir
         remaining = budget_get_remaining()
         limit = self.config.daily_budget
         consumed = limit - remaining
@@ -620,10 +1091,14 @@ class App(tk.Tk):
         else:
             entry.config(show='*')
     
+    def _open_external(self, fn, *args):
+        """Lanzar una apertura del sistema (navegador, archivo) sin bloquear Tk"""
+        # Hilo propio: el executor puede estar ocupado con transcripciones
+        threading.Thread(target=fn, args=args, daemon=True).start()
+    
     def _open_groq_website(self):
         """Abrir página de Groq para obtener API key"""
-        import webbrowser
-        webbrowser.open("https://console.groq.com/keys")
+        self._open_external(webbrowser.open, "https://console.groq.com/keys", 2)
         messagebox.showinfo("Groq API", 
             "🎁 Abriendo console.groq.com\n\n"
             "1. Crea una cuenta gratis\n"
@@ -633,37 +1108,38 @@ class App(tk.Tk):
             "¡Groq es 50x más barato que OpenAI!")
     
     def _test_api_connection(self):
-        """Probar conexión con las APIs configuradas"""
+        """Probar conexión con las APIs configuradas (en paralelo)"""
         self._update_config_from_ui()
         
-        results = []
-        
-        # Probar OpenAI
+        tests = []
         if self.config.openai_api_key:
-            try:
-                from openai import OpenAI
-                client = OpenAI(api_key=self.config.openai_api_key)
-                # Intentar listar modelos como test
-                client.models.list()
-                results.append("✅ OpenAI: Conectado")
-            except Exception as e:
-                results.append(f"❌ OpenAI: {str(e)[:50]}")
-        else:
-            results.append("⚠️ OpenAI: Sin API key")
-        
-        # Probar Groq
+            tests.append(("OpenAI", get_openai_client, self.config.openai_api_key))
         if self.config.groq_api_key:
-            try:
-                from groq import Groq
-                client = Groq(api_key=self.config.groq_api_key)
-                # Intentar listar modelos como test
-                client.models.list()
-                results.append("✅ Groq: Conectado")
-            except Exception as e:
-                results.append(f"❌ Groq: {str(e)[:50]}")
-        else:
-            results.append("⚠️ Groq: Sin API key")
+            tests.append(("Groq", get_groq_client, self.config.groq_api_key))
+        
+        # Intentar listar modelos como test, sin bloquear el hilo de Tk
+        futures = {name: self._executor.submit(lambda f=factory, k=key: f(k).models.list())
+                   for name, factory, key in tests}
+        self.status_bar.config(text="Probando conexión...")
+        self.after(100, self._poll_tests, futures)
+    
+    def _poll_tests(self, futures: dict):
+        """Esperar a los tests de conexión y mostrar el resultado"""
+        if not all(fut.done() for fut in futures.values()):
+            self.after(100, self._poll_tests, futures)
+            return
+        
+        results = []
+        for name in ("OpenAI", "Groq"):
+            fut = futures.get(name)
+            if fut is None:
+                results.append(f"⚠️ {name}: Sin API key")
+            elif fut.exception() is not None:
+                results.append(f"❌ {name}: {str(fut.exception())[:50]}")
+            else:
+                results.append(f"✅ {name}: Conectado")
         
+        self.status_bar.config(text="Listo")
         messagebox.showinfo("Test de Conexión", "\n".join(results))
     
     def _show_savings_tip(self):
@@ -689,36 +1165,15 @@ class App(tk.Tk):
             if response:
                 self._open_groq_website()
     
-    def _update_comparison(self):
-        """Actualizar tabla de comparación de costes"""
-        duration_min = self.compare_duration_var.get()
-        
-        # Limpiar tabla
-        for item in self.compare_tree.get_children():
-            self.compare_tree.delete(item)
-        
-        # Obtener info de todos los modelos
-        models_info = get_all_models_info()
-        
-        cheapest_cost = float('inf')
-        cheapest_model = ""
-        openai_cost = 0
-        
-        for info in models_info:
-            cost = info['cost_per_min'] * duration_min
-            savings = info['savings_vs_openai']
-            
-            if info['model'] == 'whisper-1':
-                openai_cost = cost
-            
-            if cost < cheapest_cost and cost > 0:
-                cheapest_cost = cost
-                cheapest_model = info['model']
-            
+    def _fill_comparison(self):
+        """Insertar una fila por modelo en la tabla de comparación"""
+        rows = []
+        for info in get_all_models_info():
             # Determinar si necesita API key
             needs_key = "✓ Sí" if info['requires_api_key'] else "No (local)"
             
             # Formato de ahorro
+            savings = info['savings_vs_openai']
             if info['is_free']:
                 savings_text = "GRATIS 🎉"
             elif savings > 0:
@@ -726,14 +1181,36 @@ class App(tk.Tk):
             else:
                 savings_text = "Referencia"
             
-            # Insertar en tabla
-            self.compare_tree.insert("", "end", values=(
-                info['model'],
-                info['provider'].upper(),
-                f"${cost:.4f}",
-                savings_text,
-                needs_key
-            ))
+            rows.append((info, (info['model'], info['provider'].upper(), "",
+                                savings_text, needs_key)))
+        
+        # Filas con iid = nombre del modelo: se editan sin recorrer get_children()
+        self.compare_tree.delete(*self.compare_tree.get_children())
+        for info, values in rows:
+            self.compare_tree.insert("", "end", iid=info['model'], values=values)
+        
+        # Columnas paralelas (iid, coste/min) para recalcular sin tocar los dicts
+        self._compare_iids = tuple(info['model'] for info, _ in rows)
+        self._compare_cpm = tuple(info['cost_per_min'] for info, _ in rows)
+    
+    def _update_comparison(self):
+        """Recalcular la columna de coste y el resumen"""
+        try:
+            duration_min = self.compare_duration_var.get()
+        except tk.TclError:
+            return  # Spinbox vacío o a medio escribir
+        
+        iids = self._compare_iids
+        costs = [cpm * duration_min for cpm in self._compare_cpm]
+        
+        for iid, cost in zip(iids, costs):
+            self.compare_tree.set(iid, "Coste", f"${cost:.4f}")
+        
+        paid = [i for i, cost in enumerate(costs) if cost > 0]
+        cheapest = min(paid, key=costs.__getitem__, default=None)
+        cheapest_cost = costs[cheapest] if cheapest is not None else float('inf')
+        cheapest_model = iids[cheapest] if cheapest is not None else ""
+        openai_cost = costs[iids.index('whisper-1')] if 'whisper-1' in iids else 0
         
         # Actualizar resumen
         if openai_cost > 0 and cheapest_cost < float('inf'):
@@ -764,16 +1241,18 @@ class App(tk.Tk):
             return
         
         self.audio = Path(file_path)
+        self.audio_duration = None
         self.lbl_filename.config(text=self.audio.name)
         
         try:
             duration_sec = probe_duration(self.audio)
+            self.audio_duration = duration_sec
             cost = estimate_cost(duration_sec, self.config.model)
             
             minutes = duration_sec // 60
             seconds = duration_sec % 60
             
-            info = f"⏱️ {minutes}:{seconds:02d} | 💰 ${cost:.4f} | 🤖 {PROVIDER_MAP.get(self.config.model, '?').upper()}"
+            info = f"⏱️ {minutes}:{seconds:02d} | 💰 ${cost:.4f} | 🤖 {_PROVIDER_LABELS.get(self.config.model, '?')}"
             self.lbl_file_info.config(text=info)
             self.status_bar.config(text=f"Archivo cargado: {self.audio.name}")
             
@@ -786,155 +1265,238 @@ class App(tk.Tk):
             messagebox.showwarning("Sin archivo", "Selecciona un archivo primero")
             return
         
+        self._update_config_from_ui()
+        
+        # Si VAD está activado, verificar tamaño del archivo y avisar
+        # (en el hilo de Tk, antes de lanzar el worker)
+        if self.config.use_vad:
+            file_size_mb = self.audio.stat().st_size / (1024 * 1024)
+            
+            if file_size_mb > 10:  # Mayor a 10 MB
+                response = messagebox.askyesno(
+                    "⚠️ Advertencia VAD",
+                    f"El archivo pesa {file_size_mb:.1f} MB.\n\n"
+                    "VAD (eliminación de silencios) puede tardar mucho\n"
+                    "y consumir toda la CPU/RAM de tu PC.\n\n"
+                    "Recomendación: Desactiva VAD en archivos grandes.\n\n"
+                    "¿Continuar con VAD de todas formas?",
+                    icon='warning'
+                )
+                
+                if not response:
+                    messagebox.showinfo(
+                        "Cancelado",
+                        "Transcripción cancelada.\n\n"
+                        "Tip: Desactiva VAD en Configuración para archivos grandes."
+                    )
+                    return
+        
         # Deshabilitar botón de transcripción
         self.transcribe_btn.configure(state="disabled")
-        self._update_config_from_ui()
-        threading.Thread(target=self._worker_single, daemon=True).start()
+        
+        # Barra de progreso
+        self._status_progress["value"] = 0
+        self._status_progress.pack(side="right", padx=5)
+        
+        def on_done():
+            # Re-habilitar botón de transcripción al terminar (éxito o error)
+            self._status_progress.pack_forget()
+            self.transcribe_btn.configure(state="normal")
+        
+        fut = self._executor.submit(self._worker_single, self.audio, self.audio_duration,
+                                    replace(self.config))
+        self.after(100, self._poll_future, fut, on_done)
+    
+    def _ui(self, fn, *args):
+        """Encolar una llamada para ejecutarla en el hilo de Tk"""
+        self._ui_q.put((fn, args))
+    
+    def _drain_ui_queue(self):
+        """Ejecutar los callbacks encolados por los workers"""
+        while True:
+            try:
+                fn, args = self._ui_q.get_nowait()
+            except queue.Empty:
+                return
+            fn(*args)
+    
+    def _poll_future(self, fut: Future, on_done=None):
+        """Vigilar un worker desde el bucle de Tk hasta que termine"""
+        self._drain_ui_queue()
+        if not fut.done():
+            self.after(100, self._poll_future, fut, on_done)
+            return
+        # El worker pudo encolar sus últimos callbacks tras el drenado anterior
+        self._drain_ui_queue()
+        try:
+            fut.result()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+        finally:
+            if on_done:
+                on_done()
+    
+    def _drain_progress_queue(self):
+        """Aplicar el último progreso encolado por los workers"""
+        value = msg = None
+        while True:
+            try:
+                current, total, text = self._progress_q.get_nowait()
+            except queue.Empty:
+                break
+            value = (current / total) * 100
+            if text:
+                msg = text
+        
+        if value is not None:
+            self._status_progress["value"] = value
+        if msg:
+            self.status_bar.config(text=msg)
+        
+        self.after(50, self._drain_progress_queue)
+    
+    def _flush_log(self):
+        """Insertar todas las líneas pendientes con un solo insert/see"""
+        lines = []
+        while True:
+            try:
+                lines.append(self._log_q.get_nowait())
+            except queue.Empty:
+                break
+        if lines:
+            self.log_text.configure(state="normal")
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+            self.log_text.configure(state="disabled")
+            self.log_text.see(tk.END)
+    
+    def _drain_log_queue(self):
+        """Volcar el log de lotes cada 50 ms"""
+        self._flush_log()
+        self.after(50, self._drain_log_queue)
+    
+    def _show_result(self, text: str):
+        """Volcar la transcripción en el Text con una sola operación de Tk"""
+        # replace = borrar + insertar en una llamada: un único re-flow
+        self.txt_result.replace("1.0", tk.END, text)
+        self.txt_result.see("1.0")
     
-    def _worker_single(self):
+    @staticmethod
+    def _estimate_parts_cost(parts, durations, model: str, cached) -> float:
+        """Coste de los chunks que no están ya en la caché (`cached`, de lookup_cached)"""
+        pending = [d for x, d in zip(parts, durations) if x not in cached]
+        if not pending:
+            return 0.0
+        return estimate_cost(sum(pending), model)
+    
+    def _worker_single(self, audio: Path, audio_duration: Optional[int], config: AppConfig):
         """Worker para transcripción única"""
+        # audio y config llegan fijados desde _run_single: elegir otro archivo
+        # o el autoguardado de la config no cambian este trabajo
+        # Temporales propios: se borran al acabar sin tocar los de un lote
+        work_dir = make_work_dir()
         try:
-            src = self.audio
-            
-            # Si VAD está activado, verificar tamaño del archivo y avisar
-            if self.config.use_vad:
-                file_size_mb = self.audio.stat().st_size / (1024 * 1024)
-                
-                if file_size_mb > 10:  # Mayor a 10 MB
-                    response = messagebox.askyesno(
-                        "⚠️ Advertencia VAD",
-                        f"El archivo pesa {file_size_mb:.1f} MB.\n\n"
-                        "VAD (eliminación de silencios) puede tardar mucho\n"
-                        "y consumir toda la CPU/RAM de tu PC.\n\n"
-                        "Recomendación: Desactiva VAD en archivos grandes.\n\n"
-                        "¿Continuar con VAD de todas formas?",
-                        icon='warning'
-                    )
-                    
-                    if not response:
-                        self.after(0, lambda: messagebox.showinfo(
-                            "Cancelado",
-                            "Transcripción cancelada.\n\n"
-                            "Tip: Desactiva VAD en Configuración para archivos grandes."
-                        ))
-                        return
-                
-                self.after(0, lambda: self.status_bar.config(text="Aplicando VAD... (puede tardar)"))
-                src = preprocess_vad_ffmpeg(self.audio)
+            src = audio
             
-            # Barra de progreso
-            progress = ttk.Progressbar(self.status_bar, mode='determinate', length=200)
-            progress.pack(side="right", padx=5)
-            self.status_bar.progress = progress
+            if config.use_vad:
+                self._ui(self.status_bar.config, {"text": "Aplicando VAD... (puede tardar)"})
+                src = preprocess_vad_ffmpeg(audio, work_dir)
             
             def update_progress(current, total, msg=""):
-                if not hasattr(self.status_bar, "progress"):
-                    return
-                progress = self.status_bar.progress
-                progress["value"] = (current / total) * 100
-                if msg:
-                    self.status_bar.config(text=msg)
-                self.update_idletasks()
+                self._progress_q.put((current, total, msg))
             
             # Procesar audio
             update_progress(0, 100, "Dividiendo audio...")
-            parts = split_for_api(src, bitrate_kbps=self.config.bitrate)
-            total = sum(probe_duration(x) for x in parts)
-            cost = estimate_cost(total, self.config.model)
+            parts, durations = split_for_api(src, bitrate_kbps=config.bitrate,
+                                             work_dir=work_dir, encoded=src != audio)
+            if not any(durations) and audio_duration:
+                durations = [audio_duration]  # Duración ya medida en _choose_file
+            # Una sola consulta a la caché: transcribe_file reutiliza lo encontrado
+            cached = lookup_cached(parts, config.model)
+            cost = self._estimate_parts_cost(parts, durations, config.model, cached)
+            if self._closing.is_set():
+                return  # Ventana cerrada mientras se preparaba el audio
             
-            if not budget_allow(cost):
-                self.after(0, lambda: messagebox.showwarning(
-                    "Presupuesto", f"Sin presupuesto para ${cost:.4f}"))
-                progress.destroy()
-                return
+            # Reservar presupuesto bajo el mismo lock que los workers del lote
+            with self._budget_lock:
+                if not budget_allow(cost):
+                    self._ui(messagebox.showwarning,
+                             "Presupuesto", f"Sin presupuesto para ${cost:.4f}")
+                    return
+                budget_day = budget_consume(cost)
             
             update_progress(10, 100, "Transcribiendo...")
-            result = transcribe_file(src, model=self.config.model)
+            try:
+                result = transcribe_file(
+                    src, model=config.model, parts=parts, durations=durations, cached=cached,
+                    progress_callback=lambda done, n: update_progress(
+                        10 + 80 * done / n, 100, f"Transcribiendo... ({done}/{n})"))
+            except Exception:
+                with self._budget_lock:
+                    budget_refund(cost, budget_day)  # Devolver la reserva
+                raise
             update_progress(90, 100, "Guardando...")
             
             # Guardar archivos en carpeta de transcripciones
             timestamp = dt.datetime.now().timestamp()
-            transcriptions_dir = Path(self.config.output_dir).parent / "transcripciones"
+            transcriptions_dir = self._transcriptions_dir
             transcriptions_dir.mkdir(exist_ok=True)
             
-            out_base = transcriptions_dir / f"{self.audio.stem}_{int(timestamp)}"
+            out_base = transcriptions_dir / f"{audio.stem}_{int(timestamp)}"
             out_txt = out_base.with_suffix(".txt")
-            out_txt.write_text(result.text, encoding="utf-8")
+            # Bytes ya codificados: sin capa de texto ni traducción de saltos
+            out_txt.write_bytes(result.text.encode("utf-8"))
             
-            has_srt = False
-            if self.config.export_srt:
-                out_srt = out_base.with_suffix(".srt")
-                out_srt.write_text(write_srt(result), encoding="utf-8")
-                has_srt = True
-            
-            # Limpiar archivos temporales
-            try:
-                for f in TEMP_DIR.glob("*"):
-                    try:
-                        f.unlink()
-                    except:
-                        pass
-            except:
-                pass
+            srt_write = None
+            if config.export_srt:
+                srt_write = _write_srt_file(out_base.with_suffix(".srt"), result)
+                self._track_write(srt_write)
             
             # Guardar referencia del resultado para el historial
             self._last_transcript = result
             
             # Guardar en el archivo del historial
-            duration = probe_duration(self.audio)
+            duration = audio_duration
+            if duration is None:
+                duration = probe_duration(audio)
+            # El historial solo apunta al SRT si llegó a escribirse
+            has_srt = srt_write is not None and srt_write.exception() is None
             history_record = {
                 "id": str(uuid.uuid4()),
                 "date": timestamp,
-                "original_file": str(self.audio),
-                "model": self.config.model,
+                "original_file": str(audio),
+                "model": config.model,
                 "duration": duration,
                 "cost": cost,
                 "language": result.language,
                 "output_path": str(out_txt),
                 "has_srt": has_srt,
-                "use_vad": self.config.use_vad
+                "use_vad": config.use_vad
             }
             
-            # Cargar historial existente
-            history_path = Path(self.config.output_dir).parent / "history.json"
+            # Añadir al historial (una línea, sin reescribir los anteriores)
             try:
-                if history_path.exists():
-                    with open(history_path, 'r', encoding='utf-8') as f:
-                        history = json.load(f)
-                else:
-                    history = []
-                    
-                # Agregar nueva transcripción
-                history.append(history_record)
-                
-                # Guardar historial actualizado
-                with open(history_path, 'w', encoding='utf-8') as f:
-                    json.dump(history, f, ensure_ascii=False, indent=2)
+                self.history.append(history_record)
                 
                 # Actualizar vista del historial
-                self.history_tab._refresh_history()
+                self._ui(self._schedule_history_refresh)
             except Exception as e:
-                print(f"Error actualizando historial: {e}")
+                logger.error("Error actualizando historial: %s", e)
             
-            self.after(0, lambda: self.txt_result.delete("1.0", tk.END))
-            self.after(0, lambda: self.txt_result.insert("1.0", result.text))
+            self._ui(self._show_result, result.text)
             
-            budget_consume(cost)
-            
-            msg = f"✅ Transcripción completada\n\n"
-            msg += f"📄 {out_txt}\n"
-            msg += f"💰 Coste: ${cost:.4f}\n"
-            msg += f"🤖 {PROVIDER_MAP.get(self.config.model, '?').upper()}"
-            
-            self.after(0, lambda: messagebox.showinfo("Éxito", msg))
-            self.after(0, self._update_budget_status)
+            # Aviso en la barra de estado, sin diálogo modal; los modales
+            # quedan para los errores. Va por la cola de progreso para que
+            # ningún mensaje anterior lo pise
+            msg = (f"✅ Transcripción completada | 📄 {out_txt.name} | "
+                   f"💰 ${cost:.4f} | 🤖 {_PROVIDER_LABELS.get(config.model, '?')}")
+            update_progress(100, 100, msg)
+            logger.info("Transcripción guardada en %s (coste $%.4f)", out_txt, cost)
+            self._ui(self._update_budget_status)
             
         except Exception as e:
-            error_msg = str(e)
-            self.after(0, lambda msg=error_msg: messagebox.showerror("Error", msg))
+            self._ui(messagebox.showerror, "Error", str(e))
         finally:
-            # Re-habilitar botón de transcripción al terminar (éxito o error)
-            self.after(0, lambda: self.transcribe_btn.configure(state="normal"))
+            remove_work_dir(work_dir)
     
     # ========================================================================
     # PROCESAMIENTO POR LOTES
@@ -949,72 +1511,136 @@ class App(tk.Tk):
     def _run_batch(self):
         """Procesar lote"""
         self._update_config_from_ui()
+        self.log_text.configure(state="normal")
         self.log_text.delete("1.0", tk.END)
-        # Deshabilitar botón de procesamiento por lotes
-        self.batch_btn.configure(state="disabled")
-        threading.Thread(target=self._worker_batch, daemon=True).start()
-    
-    def _worker_batch(self):
-        """Worker para procesamiento por lotes"""
+        self.log_text.configure(state="disabled")
+        
         inbox = Path(self.inbox_var.get())
         outdir = Path(self.out_var.get())
         outdir.mkdir(parents=True, exist_ok=True)
         
-        files = [f for f in sorted(inbox.glob("*")) if f.suffix.lower() in AUDIO_EXT]
-        total_files = len(files)
+        files = _list_audio(inbox)
+        self._log(f"📁 Encontrados {len(files)} archivos")
+        if not files:
+            return
         
-        self._log(f"📁 Encontrados {total_files} archivos")
+        # Deshabilitar botón de procesamiento por lotes
+        self.batch_btn.configure(state="disabled")
+        self.batch_cancel_btn.configure(state="normal")
+        self.batch_progress.config(value=0)
+        
+        # Copia fija de la config: el autoguardado puede cambiar self.config
+        # mientras el lote está en marcha
+        config = replace(self.config)
+        
+        # ffmpeg corre en subprocesos y la API es I/O: basta con hilos.
+        # El preprocesado va en su propio pool para solaparlo con las subidas
+        workers = max(1, min(config.batch_jobs, len(files)))
+        self._batch_prefetch = _Prefetcher(files, config, workers)
+        pool = self._batch_pool = ThreadPoolExecutor(max_workers=workers,
+                                                     thread_name_prefix="whisper-batch")
+        bases = _output_bases(files, outdir)
+        self._batch_futures = [pool.submit(self._batch_file, i, p, bases[i], config)
+                               for i, p in enumerate(files)]
+        pool.shutdown(wait=False)
+        self.after(100, self._poll_batch, files)
+    
+    def _cancel_batch(self):
+        """Cancelar los archivos del lote que aún no han empezado"""
+        cancelled = sum(fut.cancel() for fut in self._batch_futures)
+        self.batch_cancel_btn.configure(state="disabled")
+        self._log(f"⏹️ Cancelados {cancelled} archivos pendientes")
+    
+    def _poll_batch(self, files: List[Path]):
+        """Seguir el lote desde el bucle de Tk"""
+        self._drain_ui_queue()
+        futures = self._batch_futures
+        done = sum(fut.done() for fut in futures)
+        self.batch_progress.config(value=done / len(futures) * 100)
+        if done < len(futures):
+            self.after(100, self._poll_batch, files)
+            return
         
         successful = 0
-        failed = 0
         total_cost = 0.0
-        
-        for i, p in enumerate(files, 1):
-            try:
-                self._log(f"[{i}/{total_files}] {p.name}...")
-                self.after(0, lambda v=(i/total_files)*100: self.batch_progress.config(value=v))
-                
-                src = preprocess_vad_ffmpeg(p) if self.config.use_vad else p
-                parts = split_for_api(src, bitrate_kbps=self.config.bitrate)
-                total = sum(probe_duration(x) for x in parts)
-                cost = estimate_cost(total, self.config.model)
-                
-                if not budget_allow(cost):
-                    self._log(f"  ⚠️ SKIP: sin presupuesto (${cost:.4f})")
-                    failed += 1
-                    continue
-                
-                result = transcribe_file(src, model=self.config.model)
-                
-                base = outdir / p.stem
-                (base.with_suffix(".txt")).write_text(result.text, encoding="utf-8")
-                if self.config.export_srt:
-                    (base.with_suffix(".srt")).write_text(write_srt(result), encoding="utf-8")
-                
-                budget_consume(cost)
-                total_cost += cost
+        for fut in futures:
+            if fut.cancelled() or fut.exception() is not None:
+                continue
+            cost = fut.result()
+            if cost is not None:
                 successful += 1
-                
-                self._log(f"  ✅ OK (${cost:.4f})")
-                
-            except Exception as e:
-                self._log(f"  ❌ ERROR: {e}")
-                failed += 1
+                total_cost += cost
         
         self._log(f"\n{'='*50}")
-        self._log(f"✅ Completado: {successful}/{total_files}")
-        self._log(f"❌ Fallidos: {failed}")
+        self._log(f"✅ Completado: {successful}/{len(files)}")
+        self._log(f"❌ Fallidos: {len(files) - successful}")
         self._log(f"💰 Coste total: ${total_cost:.4f}")
+        self._flush_log()
         
-        self.after(0, lambda: self.batch_progress.config(value=0))
-        self.after(0, self._update_budget_status)
+        self._batch_futures = []
+        self._batch_pool = None
+        self._batch_prefetch.shutdown()
+        self._batch_prefetch = None
+        self.batch_progress.config(value=0)
+        self._update_budget_status()
         # Re-habilitar botón de procesamiento por lotes al terminar
-        self.after(0, lambda: self.batch_btn.configure(state="normal"))
+        self.batch_btn.configure(state="normal")
+        self.batch_cancel_btn.configure(state="disabled")
+    
+    def _batch_file(self, i: int, p: Path, base: Path, config: AppConfig) -> Optional[float]:
+        """Worker para un archivo del lote; devuelve el coste o None si se omite"""
+        prefetch = self._batch_prefetch
+        if self._closing.is_set():
+            prefetch.release(i)
+            return None
+        self._log(f"▶️ {p.name}...")
+        try:
+            src, parts, durations = prefetch.get(i).result()
+            # Una sola consulta a la caché: transcribe_file reutiliza lo encontrado
+            cached = lookup_cached(parts, config.model)
+            cost = self._estimate_parts_cost(parts, durations, config.model, cached)
+            
+            # Reservar presupuesto de forma atómica entre workers
+            with self._budget_lock:
+                if not budget_allow(cost):
+                    self._log(f"  ⚠️ SKIP {p.name}: sin presupuesto (${cost:.4f})")
+                    return None
+                budget_day = budget_consume(cost)
+            
+            # Mientras este archivo sube, ir preparando el siguiente
+            if not self._closing.is_set():
+                prefetch.get(i + 1)
+            try:
+                result = transcribe_file(src, model=config.model, parts=parts,
+                                         durations=durations, cached=cached)
+            except Exception:
+                with self._budget_lock:
+                    budget_refund(cost, budget_day)  # Devolver la reserva
+                raise
+            
+            # with_name y no with_suffix: "clase.v2" no debe perder ".v2"
+            base.with_name(base.name + ".txt").write_bytes(result.text.encode("utf-8"))
+            if config.export_srt:
+                self._track_write(_write_srt_file(base.with_name(base.name + ".srt"), result))
+            
+            self._log(f"  ✅ {p.name} OK (${cost:.4f})")
+            return cost
+            
+        except Exception as e:
+            self._log(f"  ❌ {p.name} ERROR: {e}")
+            raise
+        finally:
+            prefetch.release(i)
+    
+    def _track_write(self, fut: Future):
+        """Apuntar una escritura en curso (descartando las ya terminadas)"""
+        with self._writes_lock:
+            self._pending_writes = [f for f in self._pending_writes if not f.done()]
+            self._pending_writes.append(fut)
     
     def _log(self, msg: str):
-        """Añadir mensaje al log"""
-        self.after(0, lambda: self.log_text.insert(tk.END, msg + "\n"))
-        self.after(0, lambda: self.log_text.see(tk.END))
+        """Añadir mensaje al log (seguro desde cualquier hilo)"""
+        self._log_q.put(msg)
     
     # ========================================================================
     # UTILIDADES
@@ -1057,35 +1683,25 @@ class App(tk.Tk):
                     "language": language
                 }
                 
-                # Cargar historial existente
-                history_path = Path(self.config.output_dir).parent / "history.json"
+                # Añadir al historial (una línea, sin reescribir los anteriores)
                 try:
-                    if history_path.exists():
-                        with open(history_path, 'r', encoding='utf-8') as f:
-                            history = json.load(f)
-                    else:
-                        history = []
-                        
-                    # Agregar nueva transcripción
-                    history.append(record)
-                    
-                    # Guardar historial actualizado
-                    with open(history_path, 'w', encoding='utf-8') as f:
-                        json.dump(history, f, ensure_ascii=False, indent=2)
+                    self.history.append(record)
                     
                     # Actualizar vista del historial
-                    self.history_tab._refresh_history()
+                    self._schedule_history_refresh()
                 
                 except Exception as e:
-                    print(f"Error actualizando historial: {e}")
+                    logger.error("Error actualizando historial: %s", e)
                 
             except Exception as e:
                 messagebox.showerror("Error", f"No se pudo guardar: {e}")
     
     def _copy_to_clipboard(self):
         """Copiar al portapapeles"""
-        text = self.txt_result.get("1.0", tk.END).strip()
-        if not text:
+        # "end-1c" omite el salto final que añade Tk: sin copia extra por strip()
+        # (el widget es editable, así que se copia lo que muestra)
+        text = self.txt_result.get("1.0", "end-1c")
+        if not text or text.isspace():
             messagebox.showwarning("Sin contenido", "No hay texto para copiar")
             return
         
@@ -1098,15 +1714,26 @@ class App(tk.Tk):
 # MAIN
 # ============================================================================
 
+def _setup_logging():
+    """Log rotativo en ROOT (1 MB x 3 copias)"""
+    ROOT.mkdir(parents=True, exist_ok=True)
+    handler = logging.handlers.RotatingFileHandler(
+        LOG_FILE, maxBytes=1024 * 1024, backupCount=3, encoding='utf-8')
+    handler.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logging.getLogger().addHandler(handler)
+    logging.getLogger().setLevel(logging.INFO)
+
 def main():
     """Función principal"""
+    _setup_logging()
     try:
         app = App()
         app.mainloop()
     except Exception as e:
         messagebox.showerror("Error Fatal", 
             f"Error crítico:\n{e}\n\n"
-            f"Revisa el log en: {ROOT}")
+            f"Revisa el log en: {LOG_FILE}")
 
 if __name__ == "__main__":
     main()
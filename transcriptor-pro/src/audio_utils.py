@@ -15,8 +15,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-# Extensiones de audio soportadas
-AUDIO_EXTENSIONS = {'.mp3', '.wav', '.m4a', '.flac', '.opus', '.ogg', '.aac', '.wma'}
+# Extensiones de audio soportadas (en minúsculas; inmutable para compartirla)
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.flac', '.opus', '.ogg', '.aac', '.wma'})
 
 # Directorio temporal
 TEMP_DIR = Path(tempfile.gettempdir()) / "transcriptor_temp"
@@ -7,8 +7,9 @@ import json
 import datetime as dt
 from pathlib import Path
 import os
+import time
 import logging
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -16,12 +17,16 @@ logger = logging.getLogger(__name__)
 APP_ROOT = Path(os.getenv("APPDATA", Path.home())) / ".transcriptor_pro"
 BUDGET_FILE = APP_ROOT / "budget.json"
 
+# Tiempo de validez de las estadísticas cacheadas (segundos)
+STATS_CACHE_TTL = 0.5
+
 
 class BudgetManager:
     """Gestor de presupuesto diario"""
 
     def __init__(self):
         """Inicializar gestor de presupuesto"""
+        self._stats_cache: Tuple[float, Dict] = (0.0, {})
         self._ensure_file_exists()
 
     def _ensure_file_exists(self) -> None:
@@ -51,6 +56,9 @@ class BudgetManager:
         Args:
             data: Datos a guardar
         """
+        # Cualquier escritura invalida las estadísticas cacheadas
+        self._invalidate_stats()
+
         try:
             with open(BUDGET_FILE, 'w') as f:
                 json.dump(data, f, indent=2)
@@ -58,6 +66,10 @@ class BudgetManager:
         except Exception as e:
             logger.error(f"Error guardando presupuesto: {e}")
 
+    def _invalidate_stats(self) -> None:
+        """Descartar las estadísticas cacheadas"""
+        self._stats_cache = (0.0, {})
+
     def _reset_if_new_day(self) -> Dict:
         """
         Resetear presupuesto consumido si es un nuevo día
@@ -164,22 +176,32 @@ class BudgetManager:
         """
         Obtener estadísticas de presupuesto
 
+        Las estadísticas se cachean durante STATS_CACHE_TTL segundos para
+        evitar releer el archivo en refrescos consecutivos de la UI.
+
         Returns:
             dict: Estadísticas (limit, consumed, remaining, percentage)
         """
+        cached_at, cached_stats = self._stats_cache
+        if cached_stats and time.monotonic() - cached_at < STATS_CACHE_TTL:
+            return dict(cached_stats)
+
         data = self._reset_if_new_day()
         limit = data.get('limit', 2.0)
         consumed = data.get('consumed', 0.0)
         remaining = max(0, limit - consumed)
         percentage = (consumed / limit * 100) if limit > 0 else 0
 
-        return {
+        stats = {
             'limit': limit,
             'consumed': consumed,
             'remaining': remaining,
             'percentage': percentage,
             'date': data.get('date')
         }
+        self._stats_cache = (time.monotonic(), stats)
+
+        return dict(stats)
 
     def reset_today(self) -> None:
         """Resetear presupuesto consumido hoy (para testing)"""
@@ -4,8 +4,9 @@ Motor principal para transcribir audio con múltiples proveedores
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass
 import logging
 
@@ -493,6 +494,13 @@ def get_model_info(model: str) -> Dict[str, Any]:
     Returns:
         dict: Información del modelo
     """
+    # Copia para que el llamador no altere la entrada cacheada
+    return dict(_cached_model_info(model))
+
+
+@lru_cache(maxsize=None)
+def _cached_model_info(model: str) -> Dict[str, Any]:
+    """Información de un modelo, cacheada (MODEL_PRICING es constante)"""
     provider = PROVIDER_MAPPING.get(model, 'unknown')
     cost_per_min = MODEL_PRICING.get(model, 0)
 
@@ -523,13 +531,15 @@ def get_all_models() -> List[Dict[str, Any]]:
     Returns:
         list: Lista de información de modelos
     """
-    models_info = []
+    return [dict(info) for info in _cached_all_models()]
+
 
-    for model in MODEL_PRICING.keys():
-        info = get_model_info(model)
-        models_info.append(info)
+@lru_cache(maxsize=1)
+def _cached_all_models() -> Tuple[Dict[str, Any], ...]:
+    """Lista ordenada de modelos, calculada una sola vez"""
+    models_info = [_cached_model_info(model) for model in MODEL_PRICING.keys()]
 
     # Ordenar por coste (más barato primero, gratis al final)
     models_info.sort(key=lambda x: (x['cost_per_min'] if x['cost_per_min'] > 0 else float('inf')))
 
-    return models_info
+    return tuple(models_info)
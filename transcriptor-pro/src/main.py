@@ -784,10 +784,11 @@ class TranscriptorProApp(tk.Tk):
         outdir = Path(self.var_output.get())
         outdir.mkdir(parents=True, exist_ok=True)
 
-        files = [
-            f for f in sorted(inbox.glob("*"))
+        # Filtrar antes de ordenar: solo se ordenan los audios
+        files = sorted(
+            f for f in inbox.glob("*")
             if f.suffix.lower() in AUDIO_EXTENSIONS
-        ]
+        )
         total_files = len(files)
 
         self._log(f"📁 Encontrados {total_files} archivos\n")
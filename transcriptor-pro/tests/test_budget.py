@@ -2,9 +2,10 @@
 Tests para el módulo de gestión de presupuesto
 """
 
+import json
 import pytest
 from datetime import datetime, timedelta
-from src.budget import BudgetManager
+from src.budget import BudgetManager, STATS_CACHE_TTL
 
 
 class TestBudgetManager:
@@ -73,3 +74,32 @@ class TestBudgetManager:
         manager2.load()
 
         assert manager2.spent_today == 1.5
+
+    def test_stats_cache_invalidated_on_consume(self, temp_dir, monkeypatch):
+        """Test que las estadísticas cacheadas se invalidan al consumir"""
+        monkeypatch.setattr("src.budget.BUDGET_FILE", temp_dir / "budget.json")
+        manager = BudgetManager()
+
+        assert manager.get_stats()['consumed'] == 0.0
+        manager.consume(0.5)
+        assert manager.get_stats()['consumed'] == 0.5
+
+    def test_stats_cached_within_ttl(self, temp_dir, monkeypatch):
+        """Test que get_stats se sirve de la caché dentro del TTL y se recalcula después"""
+        budget_file = temp_dir / "budget.json"
+        monkeypatch.setattr("src.budget.BUDGET_FILE", budget_file)
+        now = [100.0]
+        monkeypatch.setattr("src.budget.time.monotonic", lambda: now[0])
+        manager = BudgetManager()
+        assert manager.get_stats()['consumed'] == 0.0
+
+        # Cambio externo (sin pasar por _save_data): no invalida la caché
+        data = json.loads(budget_file.read_text())
+        data['consumed'] = 0.75
+        budget_file.write_text(json.dumps(data))
+
+        now[0] += STATS_CACHE_TTL / 2
+        assert manager.get_stats()['consumed'] == 0.0
+
+        now[0] += STATS_CACHE_TTL
+        assert manager.get_stats()['consumed'] == 0.75
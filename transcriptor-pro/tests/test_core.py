@@ -17,36 +17,16 @@ from src.core import (
 class TestCostCalculation:
     """Tests para cálculo de costes"""
 
-    def test_calculate_cost_groq_whisper(self):
-        """Test cálculo de coste con Groq Whisper"""
-        duration = 60  # 1 minuto
-        model = "groq-whisper-large-v3"
+    @pytest.mark.parametrize("duration,model,expected_factor", [
+        (60, "groq-whisper-large-v3", 1),  # 1 minuto con Groq Whisper
+        (120, "whisper-1", 2),             # 2 minutos con OpenAI
+        (3600, "local-base", 0),           # Modelos locales son gratis
+        (30, "whisper-1", 1),              # Duración mínima es 1 minuto
+    ])
+    def test_calculate_cost(self, duration, model, expected_factor):
+        """Test cálculo de coste por modelo y duración"""
         cost = calculate_cost(duration, model)
-        expected = MODEL_PRICING[model]
-        assert cost == pytest.approx(expected, rel=0.01)
-
-    def test_calculate_cost_openai(self):
-        """Test cálculo de coste con OpenAI"""
-        duration = 120  # 2 minutos
-        model = "whisper-1"
-        cost = calculate_cost(duration, model)
-        expected = 2 * MODEL_PRICING[model]
-        assert cost == pytest.approx(expected, rel=0.01)
-
-    def test_calculate_cost_local_is_free(self):
-        """Test que modelos locales son gratis"""
-        duration = 3600  # 1 hora
-        model = "local-base"
-        cost = calculate_cost(duration, model)
-        assert cost == 0.0
-
-    def test_calculate_cost_minimum_duration(self):
-        """Test que duración mínima es 1 minuto"""
-        duration = 30  # 30 segundos
-        model = "whisper-1"
-        cost = calculate_cost(duration, model)
-        # Debe cobrar como mínimo 1 minuto
-        expected = MODEL_PRICING[model]
+        expected = expected_factor * MODEL_PRICING[model]
         assert cost == pytest.approx(expected, rel=0.01)
 
 
@@ -85,9 +65,14 @@ class TestModelInfo:
         """Test obtener todos los modelos"""
         models = get_all_models()
         assert len(models) > 0
-        assert "groq-whisper-large-v3" in models
-        assert "whisper-1" in models
-        assert "local-base" in models
+        names = [m["model"] for m in models]
+        assert "groq-whisper-large-v3" in names
+        assert "whisper-1" in names
+        assert "local-base" in names
+
+        # El resultado cacheado no debe verse alterado por el llamador
+        models[0]["cost_per_min"] = -1
+        assert get_all_models()[0]["cost_per_min"] != -1
 
     def test_get_model_info(self):
         """Test obtener información de un modelo"""